@@ -14,6 +14,14 @@ class Agent(ABC):
     to interact with the BoardBench framework.
     """
     
+    # True for agents that pick uniformly at random among the legal moves and
+    # provide draw_seed, so their matches can be run by a compiled playout
+    plays_uniform_random = False
+    
+    # True for agents whose game_start and game_end hooks block on I/O, such
+    # as network calls, so the runner notifies them concurrently
+    blocking_hooks = False
+    
     @property
     @abstractmethod
     def name(self) -> str:
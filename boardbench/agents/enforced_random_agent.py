@@ -1,4 +1,3 @@
-import random
 from typing import Any, List, Optional
 
 import numpy as np
@@ -50,21 +49,72 @@ class EnforcedRandomAgent(RandomAgent):
             raise ValueError("Empty legal_moves list provided")
             
         # Double-check with the game that the moves are actually legal
+        indices = self._move_indices(game, legal_moves)
+        if indices is None:
+            validated_moves = self._validate_by_simulation(game, state, legal_moves, player)
+        else:
+            # A single legality mask lookup instead of simulating every move
+            mask = game.legal_mask(state, player)
+            in_bounds = np.all((indices >= 0) & (indices < mask.shape[:indices.shape[1]]), axis=1)
+            allowed = np.zeros(len(legal_moves), dtype=bool)
+            allowed[in_bounds] = mask[tuple(indices[in_bounds].T)]
+            validated_moves = [move for move, ok in zip(legal_moves, allowed) if ok]
+            
+        if not validated_moves:
+            raise ValueError("No valid moves available after validation")
+            
+        return validated_moves[self._rng.integers(len(validated_moves))]
+    
+    @staticmethod
+    def _move_indices(game: Game, legal_moves: List[Any]) -> Optional[np.ndarray]:
+        """
+        Get the moves as rows of mask indices, if the game's legality mask can check them.
+        
+        Args:
+            game: The game being played
+            legal_moves: List of legal moves available
+            
+        Returns:
+            Integer array with one row per move, or None if the moves must be
+            checked by simulation instead
+        """
+        # The default mask is shaped like the state, so it only fits games
+        # whose moves are board coordinates; only trust overridden masks
+        if not hasattr(game, "legal_mask") or getattr(type(game), "legal_mask", None) is Game.legal_mask:
+            return None
+        try:
+            indices = np.asarray(legal_moves)
+        except ValueError:
+            # Moves of different lengths
+            return None
+        if indices.dtype.kind not in "iu":
+            return None
+        return indices.reshape(len(legal_moves), -1)
+    
+    @staticmethod
+    def _validate_by_simulation(game: Game, state: np.ndarray, legal_moves: List[Any],
+                                player: int) -> List[Any]:
+        """
+        Keep the moves the game accepts when applied to a copy of the state.
+        
+        Args:
+            game: The game being played
+            state: The current state of the game
+            legal_moves: List of legal moves available
+            player: The player number this agent is playing as
+            
+        Returns:
+            The moves that did not raise a ValueError
+        """
         validated_moves = []
         for move in legal_moves:
             try:
-                # Check if the move is valid by simulation (doesn't actually make the move)
-                test_state = state.copy()
-                game.make_move(test_state, move, player)
+                game.make_move(state.copy(), move, player)
                 validated_moves.append(move)
             except ValueError:
                 # Skip any move that would cause an error
                 continue
-            
-        if not validated_moves:
-            raise ValueError("No valid moves available after validation")
-            
-        return random.choice(validated_moves)
+        return validated_moves
     
     def move_feedback(self, game: Game, state: np.ndarray, move: Any, 
                       success: bool, message: str = "") -> None:
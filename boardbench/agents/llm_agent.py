@@ -1,3 +1,5 @@
+import random
+import re
 import time
 from typing import Any, List, Dict, Optional
 
@@ -23,6 +25,9 @@ class LLMAgent(Agent):
     then uses an LLM to select moves.
     """
     
+    # Pattern for the chosen move index in the LLM response
+    _MOVE_RE = re.compile(r"MOVE:\s*(\d+)", re.IGNORECASE)
+    
     def __init__(
         self, 
         name: str = "LLMAgent",
@@ -67,6 +72,12 @@ class LLMAgent(Agent):
             )
         else:
             self._system_prompt = system_prompt
+        
+        # Rendering caches for _create_prompt, valid for a single game instance
+        self._cached_game = None
+        self._move_strings: Dict[Any, str] = {}
+        self._last_state_key: Optional[bytes] = None
+        self._last_board_str = ""
     
     @property
     def name(self) -> str:
@@ -101,12 +112,22 @@ class LLMAgent(Agent):
     
     def _create_prompt(self, game: Game, state: np.ndarray, legal_moves: List[Any], player: int) -> str:
         """Create a prompt describing the game state and legal moves."""
-        # Display the current game state as a string
-        board_display = game.display_state(state)
+        if game is not self._cached_game:
+            self._cached_game = game
+            self._move_strings = {}
+            self._last_state_key = None
+        
+        # Display the current game state as a string, reusing the last
+        # rendering when the board has not changed (e.g. on re-prompts)
+        state_key = state.tobytes()
+        if state_key != self._last_state_key:
+            self._last_board_str = game.display_state(state)
+            self._last_state_key = state_key
+        board_display = self._last_board_str
         
         # Format the legal moves for display
         moves_display = "\n".join([
-            f"- Move {i}: {game.move_to_string(move)}"
+            f"- Move {i}: {self._move_to_string(game, move)}"
             for i, move in enumerate(legal_moves)
         ])
         
@@ -127,6 +148,14 @@ For example: "MOVE: 2"
 """
         return prompt
     
+    def _move_to_string(self, game: Game, move: Any) -> str:
+        """Convert a move to a string, memoized per move for the current game."""
+        move_str = self._move_strings.get(move)
+        if move_str is None:
+            move_str = game.move_to_string(move)
+            self._move_strings[move] = move_str
+        return move_str
+    
     def _query_llm(self, prompt: str) -> str:
         """Query the LLM with the given prompt."""
         for attempt in range(self._max_retries):
@@ -150,9 +179,7 @@ For example: "MOVE: 2"
     def _parse_response(self, response: str, game: Game, legal_moves: List[Any]) -> Any:
         """Parse the LLM response to extract the chosen move."""
         # Look for "MOVE: X" pattern in the response
-        import re
-        
-        match = re.search(r"MOVE:\s*(\d+)", response, re.IGNORECASE)
+        match = self._MOVE_RE.search(response)
         if match:
             move_index = int(match.group(1))
             
@@ -160,6 +187,5 @@ For example: "MOVE: 2"
                 return legal_moves[move_index]
         
         # If we didn't find a valid move, fall back to a random choice
-        import random
         print("Failed to parse valid move from LLM response. Using fallback random choice.")
         return random.choice(legal_moves)
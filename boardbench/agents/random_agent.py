@@ -1,5 +1,4 @@
-import random
-from typing import Any, List
+from typing import Any, List, Optional
 
 import numpy as np
 
@@ -14,7 +13,9 @@ class RandomAgent(Agent):
     Useful as a baseline or for testing the game mechanics.
     """
     
-    def __init__(self, name: str = "RandomAgent", seed: int = None):
+    plays_uniform_random = True
+    
+    def __init__(self, name: str = "RandomAgent", seed: Optional[int] = None):
         """
         Initialize a random agent.
         
@@ -24,13 +25,25 @@ class RandomAgent(Agent):
         """
         self._name = name
         
-        if seed is not None:
-            random.seed(seed)
+        # Each agent draws from its own stream, so seeded agents stay
+        # reproducible regardless of what other agents or matches do
+        self._rng = np.random.default_rng(seed)
     
     @property
     def name(self) -> str:
         return self._name
     
+    def draw_seed(self) -> int:
+        """
+        Draw a seed from this agent's random stream.
+        
+        Used to seed compiled random playouts reproducibly.
+        
+        Returns:
+            A 32-bit unsigned integer seed
+        """
+        return int(self._rng.integers(2**32))
+    
     def make_move(self, game: Game, state: np.ndarray, legal_moves: List[Any], player: int) -> Any:
         """
         Choose a random move from the list of legal moves.
@@ -47,4 +60,4 @@ class RandomAgent(Agent):
         if not legal_moves:
             raise ValueError("No legal moves available")
             
-        return random.choice(legal_moves)
+        return legal_moves[self._rng.integers(len(legal_moves))]
@@ -0,0 +1,70 @@
+from typing import List, Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from boardbench.engine.match_runner import MatchRunner
+
+
+class BatchMatchRunner:
+    """
+    Runs many matches concurrently.
+    
+    Each match is played by its own MatchRunner on a worker thread, and the
+    workers are driven from an asyncio event loop with asyncio.gather. Agents
+    that block on network I/O (such as LLMAgent) release the GIL while waiting
+    for a response, so pending moves from different matches are in flight at
+    the same time instead of being serialized on HTTP round-trips.
+    """
+    
+    def __init__(self, runners: List[MatchRunner], max_concurrency: Optional[int] = None):
+        """
+        Initialize a batch match runner.
+        
+        Args:
+            runners: The matches to play. Runners must not share game or agent
+                instances, since each one is driven from its own thread.
+            max_concurrency: Maximum number of matches in progress at once
+                (defaults to all of them)
+        """
+        if not runners:
+            raise ValueError("At least one match runner is required")
+        
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        
+        self.runners = runners
+        self.max_concurrency = max_concurrency or len(runners)
+    
+    async def run_matches_async(self, max_moves: int = 1000, verbose: bool = False) -> List[Dict[str, Any]]:
+        """
+        Run all matches concurrently from within a running event loop.
+        
+        Args:
+            max_moves: Maximum number of moves per match before declaring a draw
+            verbose: If True, display game state after each move (output from
+                concurrent matches will be interleaved)
+        
+        Returns:
+            List of match result dictionaries, in the same order as the runners
+        """
+        loop = asyncio.get_running_loop()
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [
+                loop.run_in_executor(executor, runner.run_match, max_moves, verbose)
+                for runner in self.runners
+            ]
+            return list(await asyncio.gather(*futures))
+    
+    def run_matches(self, max_moves: int = 1000, verbose: bool = False) -> List[Dict[str, Any]]:
+        """
+        Run all matches concurrently and wait for them to finish.
+        
+        Args:
+            max_moves: Maximum number of moves per match before declaring a draw
+            verbose: If True, display game state after each move
+        
+        Returns:
+            List of match result dictionaries, in the same order as the runners
+        """
+        return asyncio.run(self.run_matches_async(max_moves=max_moves, verbose=verbose))
@@ -1,9 +1,11 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import time
-import json
+import random
+import inspect
 import os
 import uuid
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -12,6 +14,18 @@ from boardbench.agents.base import Agent
 from boardbench.utils.logger import Logger
 
 
+def _accepts_last_move(is_terminal: Callable) -> bool:
+    """Check whether a game's is_terminal takes the last move, which older games don't."""
+    try:
+        inspect.signature(is_terminal).bind(None, None)
+    except TypeError:
+        return False
+    except ValueError:
+        # No signature available, so assume the current interface
+        return True
+    return True
+
+
 class MatchRunner:
     """
     Core engine for running matches between agents.
@@ -19,7 +33,9 @@ class MatchRunner:
     This class handles the game flow, enforces rules, and records match data.
     """
     
-    def __init__(self, game: Game, agents: List[Agent], logger: Optional[Logger] = None):
+    def __init__(self, game: Game, agents: List[Agent], logger: Optional[Logger] = None,
+                 stream_moves: bool = False, seed: Optional[int] = None,
+                 compiled_random: bool = False):
         """
         Initialize a match runner.
         
@@ -27,20 +43,38 @@ class MatchRunner:
             game: The game to be played
             agents: List of agents participating in the game (order matters)
             logger: Optional logger for match data
+            stream_moves: If True, write each move to the logger as it is played
+                instead of keeping the move history in memory
+            seed: Optional random seed for the legal moves substituted for
+                invalid ones
+            compiled_random: If True, and every agent plays uniformly random
+                moves, play the match with the game's compiled random playout.
+                The agents' make_move and move_feedback are then not called,
+                the moves differ from a match played move by move, and each
+                move's time is the playout's average
         """
         self.game = game
         self.agents = agents
+        self.stream_moves = stream_moves
+        self._rng = random.Random(seed)
+        self.compiled_random = compiled_random
+        
+        # Games written against the old is_terminal(state) only get the state
+        self._terminal_takes_last_move = _accepts_last_move(game.is_terminal)
         
         if len(agents) != game.num_players:
             raise ValueError(f"{game.name} requires {game.num_players} players, but {len(agents)} agents were provided")
         
-        # Create a default logger if none provided
+        # Create a default logger if none provided; the runner closes only a
+        # logger it created, and callers close their own
+        self._owns_logger = logger is None
         self.logger = logger or Logger(os.path.join("boardbench", "logs"))
         
         # Match metadata
         self.match_id = str(uuid.uuid4())
         self.moves_history = []
-        self.states_history = []
+        self.num_recorded_moves = 0
+        self.final_state = None
         self.move_times = []
     
     def run_match(self, max_moves: int = 1000, verbose: bool = True) -> Dict[str, Any]:
@@ -56,33 +90,49 @@ class MatchRunner:
         """
         # Initialize the game
         state = self.game.reset()
-        self.states_history.append(np.copy(state))
+        self.final_state = state
         
         # Notify agents of game start
-        for i, agent in enumerate(self.agents):
-            agent.game_start(self.game, i)
+        self._notify_agents(lambda i, agent: agent.game_start(self.game, i))
         
         current_player = 0
         move_count = 0
         winner = None
         
+        # On request, matches between random agents are played out by a
+        # compiled kernel, which leaves the state terminal or at max_moves
+        if self.compiled_random and self._can_use_random_playout():
+            state, move_count = self._run_random_playout(state, max_moves)
+        
+        # Hoist the game methods used every turn out of the loop
+        is_terminal = self.game.is_terminal
+        if not self._terminal_takes_last_move:
+            is_terminal = lambda state, last_move, check=is_terminal: check(state)
+        get_legal_moves = self.game.get_legal_moves
+        make_move = self.game.make_move
+        num_players = self.game.num_players
+        two_players = num_players == 2
+        
+        # The last applied move lets the game check only the lines it touches
+        last_move = None
+        
         # Main game loop
-        while not self.game.is_terminal(state) and move_count < max_moves:
+        while not is_terminal(state, last_move) and move_count < max_moves:
             # Get current agent
             agent = self.agents[current_player]
             
             # Get legal moves
-            legal_moves = self.game.get_legal_moves(state, current_player)
+            legal_moves = get_legal_moves(state, current_player)
             
             if not legal_moves:
                 # No legal moves available, skip turn
                 if verbose:
                     print(f"Player {current_player} ({agent.name}) has no legal moves and must pass.")
-                current_player = (current_player + 1) % self.game.num_players
+                current_player = current_player ^ 1 if two_players else (current_player + 1) % num_players
                 continue
             
             # Ask agent for move
-            start_time = time.time()
+            start_time = time.perf_counter_ns()
             move = None
             move_success = False
             error_message = ""
@@ -97,8 +147,7 @@ class MatchRunner:
             except Exception as e:
                 error_message = f"Agent error: {str(e)}"
             
-            end_time = time.time()
-            elapsed = end_time - start_time
+            elapsed = (time.perf_counter_ns() - start_time) * 1e-9
             
             # Provide feedback to the agent
             agent.move_feedback(self.game, state, move, move_success, error_message)
@@ -112,13 +161,13 @@ class MatchRunner:
                     "move": self.game.move_to_string(move),
                     "time_taken": elapsed
                 }
-                self.moves_history.append(move_info)
-                self.move_times.append(elapsed)
+                self._record_move(move_info)
                 
                 # Apply move
-                new_state = self.game.make_move(state, move, current_player)
+                new_state = make_move(state, move, current_player)
                 state = new_state
-                self.states_history.append(np.copy(state))
+                last_move = move
+                self.final_state = state
                 
                 # Display if verbose
                 if verbose:
@@ -128,7 +177,7 @@ class MatchRunner:
                     print("=" * 40)
                 
                 # Switch to next player
-                current_player = (current_player + 1) % self.game.num_players
+                current_player = current_player ^ 1 if two_players else (current_player + 1) % num_players
                 move_count += 1
             else:
                 # Invalid move
@@ -138,26 +187,25 @@ class MatchRunner:
                 # Let the agent try again or apply a penalty based on your preferred rules
                 # For now, we'll give them a random legal move
                 if legal_moves:
-                    import random
-                    move = random.choice(legal_moves)
+                    move = self._rng.choice(legal_moves)
                     
                     if verbose:
                         print(f"Choosing random legal move instead: {self.game.move_to_string(move)}")
                     
-                    new_state = self.game.make_move(state, move, current_player)
+                    new_state = make_move(state, move, current_player)
                     state = new_state
-                    self.states_history.append(np.copy(state))
+                    last_move = move
+                    self.final_state = state
                 
                 # Switch to next player
-                current_player = (current_player + 1) % self.game.num_players
+                current_player = current_player ^ 1 if two_players else (current_player + 1) % num_players
                 move_count += 1
         
         # Game over
         winner = self.game.get_winner(state)
         
         # Notify agents of game end
-        for i, agent in enumerate(self.agents):
-            agent.game_end(self.game, state, winner, i)
+        self._notify_agents(lambda i, agent: agent.game_end(self.game, state, winner, i))
         
         # Prepare results
         result = {
@@ -165,14 +213,18 @@ class MatchRunner:
             "game": self.game.name,
             "date": datetime.now().isoformat(),
             "agents": [agent.name for agent in self.agents],
-            "moves": len(self.moves_history),
+            "moves": self.num_recorded_moves,
             "winner": winner,
             "avg_move_time": sum(self.move_times) / len(self.move_times) if self.move_times else 0,
             "max_move_time": max(self.move_times) if self.move_times else 0,
         }
         
         # Log the match
-        self.log_match(result)
+        try:
+            self.log_match(result)
+        finally:
+            if self._owns_logger:
+                self.logger.close()
         
         if verbose:
             if winner is not None:
@@ -183,6 +235,82 @@ class MatchRunner:
         
         return result
     
+    def _notify_agents(self, notify: Callable[[int, Agent], None]) -> None:
+        """
+        Call a notification hook for every agent.
+        
+        If any agent declares blocking_hooks, for example because its hooks
+        make network calls, the agents are notified concurrently. Otherwise
+        they are notified in order, without the overhead of a thread pool.
+        
+        Args:
+            notify: Function called with each player number and agent
+        """
+        if any(getattr(agent, "blocking_hooks", False) is True for agent in self.agents):
+            with ThreadPoolExecutor(max_workers=len(self.agents)) as executor:
+                list(executor.map(notify, range(len(self.agents)), self.agents))
+        else:
+            for i, agent in enumerate(self.agents):
+                notify(i, agent)
+    
+    def _can_use_random_playout(self) -> bool:
+        """Check whether the game has a random playout and every agent plays uniformly random moves."""
+        if getattr(type(self.game), "random_playout", Game.random_playout) is Game.random_playout:
+            return False
+        # Compare with True, so mock agents with unset attributes don't qualify
+        return all(getattr(agent, "plays_uniform_random", False) is True for agent in self.agents)
+    
+    def _run_random_playout(self, state: np.ndarray, max_moves: int) -> Tuple[np.ndarray, int]:
+        """
+        Play the whole match with the game's compiled random playout.
+        
+        The playout is seeded from the agents' own random streams, so seeded
+        agents still produce reproducible matches.
+        
+        Args:
+            state: The initial game state
+            max_moves: Maximum number of moves before declaring a draw
+            
+        Returns:
+            Tuple of (final state, number of moves)
+        """
+        seed_sequence = np.random.SeedSequence([agent.draw_seed() for agent in self.agents])
+        seed = int(seed_sequence.generate_state(1)[0])
+        
+        start_time = time.perf_counter_ns()
+        state, moves, _ = self.game.random_playout(state, max_moves, seed)
+        elapsed = (time.perf_counter_ns() - start_time) * 1e-9
+        
+        # Per-move timings are not observable inside the kernel, so the total
+        # is spread evenly over the moves
+        time_per_move = elapsed / len(moves) if moves else 0
+        for i, move in enumerate(moves):
+            player = i % self.game.num_players
+            self._record_move({
+                "player": player,
+                "agent_name": self.agents[player].name,
+                "move": self.game.move_to_string(move),
+                "time_taken": time_per_move
+            })
+        
+        self.final_state = state
+        return state, len(moves)
+    
+    def _record_move(self, move_info: Dict[str, Any]) -> None:
+        """
+        Record a move in the history, or stream it to the logger.
+        
+        Args:
+            move_info: Dictionary describing the move, including its time taken
+        """
+        if self.stream_moves:
+            self.logger.log_move(self.match_id, move_info)
+        else:
+            self.moves_history.append(move_info)
+        
+        self.num_recorded_moves += 1
+        self.move_times.append(move_info["time_taken"])
+    
     def log_match(self, result: Dict[str, Any]) -> str:
         """
         Log match results and history to a file.
@@ -193,12 +321,12 @@ class MatchRunner:
         Returns:
             The path to the log file
         """
-        # Create a complete log including moves and states
-        log_data = {
-            **result,
-            "moves_history": self.moves_history,
-            "final_state": self.game.get_state_representation(self.states_history[-1]),
-        }
+        # Create a complete log including moves and states. Streamed moves are
+        # already in the logger's move log, which it references on its own.
+        log_data = dict(result)
+        if not self.stream_moves:
+            log_data["moves_history"] = self.moves_history
+        log_data["final_state"] = self.game.get_state_representation(self.final_state)
         
         # Save to log file via the logger
         log_file = self.logger.log_match(log_data)
@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Tuple, Any, Dict
 import numpy as np
 
+# Default number of positions whose winner a game remembers
+WINNER_CACHE_SIZE = 1 << 16
+
 
 class Game(ABC):
     """
@@ -46,8 +49,45 @@ class Game(ABC):
         """
         pass
     
+    def legal_mask(self, state: np.ndarray, player: int) -> np.ndarray:
+        """
+        Get a boolean mask of legal moves that can be indexed by a move.
+        
+        The default implementation marks every move from get_legal_moves in a
+        mask shaped like the state, which suits games whose moves are board
+        indices. Games should override this with a vectorized check.
+        
+        Args:
+            state (np.ndarray): The current game state.
+            player (int): The player whose turn it is.
+            
+        Returns:
+            np.ndarray: A boolean mask where mask[move] is True for legal moves.
+        """
+        mask = np.zeros(state.shape, dtype=bool)
+        for move in self.get_legal_moves(state, player):
+            mask[move] = True
+        return mask
+    
+    def count_legal_moves(self, state: np.ndarray, player: int) -> int:
+        """
+        Count the legal moves for the current player.
+        
+        Games should override this when the count is cheaper to get than the
+        list of moves itself.
+        
+        Args:
+            state (np.ndarray): The current game state.
+            player (int): The player whose turn it is.
+            
+        Returns:
+            int: The number of legal moves.
+        """
+        return len(self.get_legal_moves(state, player))
+    
     @abstractmethod
-    def make_move(self, state: np.ndarray, move: Any, player: int) -> np.ndarray:
+    def make_move(self, state: np.ndarray, move: Any, player: int,
+                  inplace: bool = False) -> np.ndarray:
         """
         Apply a move to the current state and return the new state.
         
@@ -55,19 +95,75 @@ class Game(ABC):
             state (np.ndarray): The current game state.
             move (Any): The move to apply.
             player (int): The player making the move.
+            inplace (bool): If True, modify and return the given state instead
+                of a copy.
             
         Returns:
             np.ndarray: The new state after the move.
         """
         pass
     
+    def make_move_inplace(self, state: np.ndarray, move: Any, player: int) -> None:
+        """
+        Apply a move by modifying the state in place.
+        
+        This is the allocation-free variant of make_move for search code that
+        only passes legal moves and reverts them with undo_move.
+        
+        Args:
+            state (np.ndarray): The game state, modified in place.
+            move (Any): The legal move to apply.
+            player (int): The player making the move.
+            
+        Raises:
+            NotImplementedError: If the game does not support in-place moves.
+        """
+        raise NotImplementedError(f"{self.name} does not support in-place moves")
+    
+    def undo_move(self, state: np.ndarray, move: Any) -> None:
+        """
+        Revert the most recent move applied with make_move_inplace.
+        
+        Args:
+            state (np.ndarray): The game state, modified in place.
+            move (Any): The move to revert.
+            
+        Raises:
+            NotImplementedError: If the game does not support in-place moves.
+        """
+        raise NotImplementedError(f"{self.name} does not support in-place moves")
+    
+    def random_playout(self, state: np.ndarray, max_moves: int,
+                       seed: int) -> Tuple[np.ndarray, List[Any], Optional[int]]:
+        """
+        Play uniformly random moves for all players, starting with player 0.
+        
+        Games can implement this with a compiled kernel so that matches
+        between random agents skip the per-move Python overhead.
+        
+        Args:
+            state (np.ndarray): The starting state, which must not be terminal.
+            max_moves (int): Maximum number of moves to play.
+            seed (int): Seed for the random number generator.
+            
+        Returns:
+            Tuple[np.ndarray, List[Any], Optional[int]]: The final state, the
+            moves played in order, and the winner (None if no winner).
+            
+        Raises:
+            NotImplementedError: If the game does not support random playouts.
+        """
+        raise NotImplementedError(f"{self.name} does not support random playouts")
+    
     @abstractmethod
-    def is_terminal(self, state: np.ndarray) -> bool:
+    def is_terminal(self, state: np.ndarray, last_move: Optional[Any] = None) -> bool:
         """
         Check if the state is terminal (game over).
         
         Args:
             state (np.ndarray): The game state to check.
+            last_move (Optional[Any]): The move that produced this state, if known.
+                Games may use it to check only for wins that move could have created.
             
         Returns:
             bool: True if the game is over, False otherwise.
@@ -87,6 +183,39 @@ class Game(ABC):
         """
         pass
     
+    def get_winner_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Get the winner of each state in a batch.
+        
+        The default implementation calls get_winner for every state. Games
+        should override this with a vectorized check.
+        
+        Args:
+            states (np.ndarray): Game states stacked along the first axis.
+            
+        Returns:
+            np.ndarray: int8 array with the winning player of each state, or
+            -1 where there is no winner.
+        """
+        winners = [self.get_winner(state) for state in states]
+        return np.array([-1 if winner is None else winner for winner in winners], dtype=np.int8)
+    
+    @staticmethod
+    def state_key(state: np.ndarray) -> bytes:
+        """
+        Get a hashable fingerprint of a state, for use as a cache key.
+        
+        States of the same game share a shape and dtype, so their raw bytes
+        identify them.
+        
+        Args:
+            state (np.ndarray): The game state.
+            
+        Returns:
+            bytes: The raw contents of the state.
+        """
+        return state.tobytes()
+    
     @abstractmethod
     def get_state_representation(self, state: np.ndarray) -> Dict[str, Any]:
         """
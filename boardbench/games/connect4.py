@@ -1,7 +1,10 @@
 import numpy as np
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any, Tuple
 
-from boardbench.games.base import Game
+from boardbench.games.base import Game, WINNER_CACHE_SIZE
+from boardbench.games import kernels
+from boardbench.utils.jit import NUMBA_AVAILABLE
 
 
 class Connect4(Game):
@@ -25,6 +28,16 @@ class Connect4(Game):
         self._cols = cols
         self._win_length = win_length
         self._current_player = 0
+        
+        # Copied by reset, which is cheaper than allocating a zeroed board
+        self._empty_state = np.zeros((rows, cols), dtype=np.int8)
+        
+        # Winners of recently checked positions, least recently used first
+        self._winner_cache = OrderedDict()
+        
+        if NUMBA_AVAILABLE:
+            # Compile the win scan up front rather than during the first match
+            kernels.scan_winner(np.zeros((1, 1), dtype=np.int8), win_length)
     
     @property
     def name(self) -> str:
@@ -37,7 +50,7 @@ class Connect4(Game):
     def reset(self) -> np.ndarray:
         """Reset the game to an empty board."""
         # 0 = empty, 1 = player 1, 2 = player 2
-        state = np.zeros((self._rows, self._cols), dtype=np.int8)
+        state = self._empty_state.copy()
         self._current_player = 0
         return state
     
@@ -52,9 +65,23 @@ class Connect4(Game):
         Returns:
             List of column indices where a piece can be dropped
         """
-        return [col for col in range(self._cols) if state[0, col] == 0]
+        return [col for col, top in enumerate(state[0].tolist()) if top == 0]
     
-    def make_move(self, state: np.ndarray, move: int, player: int) -> np.ndarray:
+    def legal_mask(self, state: np.ndarray, player: int) -> np.ndarray:
+        """
+        Get a boolean mask of the columns that can still take a piece.
+        
+        Args:
+            state: The current game state
+            player: The player whose turn it is
+            
+        Returns:
+            Boolean array of length cols, True where the top cell is empty
+        """
+        return state[0] == 0
+    
+    def make_move(self, state: np.ndarray, move: int, player: int,
+                  inplace: bool = False) -> np.ndarray:
         """
         Drop a piece in the specified column.
         
@@ -62,75 +89,161 @@ class Connect4(Game):
             state: The current game state
             move: The column index to drop the piece in
             player: The player making the move
+            inplace: If True, modify and return the given state instead of a copy
             
         Returns:
             The new state after the move
         """
-        new_state = state.copy()
+        # Pieces always stack from the bottom, so the column height gives the
+        # landing row directly
+        height = np.count_nonzero(state[:, move])
+        if height >= self._rows:
+            raise ValueError(f"Column {move} is full")
         
-        # Find the lowest empty row in the specified column
-        for row in range(self._rows - 1, -1, -1):
-            if new_state[row, move] == 0:
-                # Place the piece (player number + 1)
-                new_state[row, move] = player + 1
-                break
+        new_state = state if inplace else state.copy()
+        # Place the piece (player number + 1)
+        new_state[self._rows - 1 - height, move] = player + 1
         
         return new_state
     
-    def is_terminal(self, state: np.ndarray) -> bool:
+    def make_move_inplace(self, state: np.ndarray, move: int, player: int) -> None:
+        """
+        Drop a piece by modifying the state in place.
+        
+        Args:
+            state: The game state, modified in place
+            move: The column index to drop the piece in
+            player: The player making the move
+        """
+        height = np.count_nonzero(state[:, move])
+        if height >= self._rows:
+            raise ValueError(f"Column {move} is full")
+        state[self._rows - 1 - height, move] = player + 1
+    
+    def undo_move(self, state: np.ndarray, move: int) -> None:
+        """
+        Remove the top piece of a column, placed by make_move_inplace.
+        
+        Args:
+            state: The game state, modified in place
+            move: The column the piece was dropped in
+        """
+        height = np.count_nonzero(state[:, move])
+        if height == 0:
+            raise ValueError(f"Column {move} is empty")
+        state[self._rows - height, move] = 0
+    
+    def random_playout(self, state: np.ndarray, max_moves: int,
+                       seed: int) -> Tuple[np.ndarray, List[int], Optional[int]]:
+        """
+        Play uniformly random moves for both players with a compiled kernel.
+        
+        Args:
+            state: The starting state, which must not be terminal
+            max_moves: Maximum number of moves to play
+            seed: Seed for the random number generator
+            
+        Returns:
+            The final state, the moves played in order, and the winner
+            (None if no winner)
+        """
+        board = state.copy()
+        cells, num_moves, winner = kernels.random_playout(board, self._win_length, True, max_moves, seed)
+        moves = [int(col) for col in cells[:num_moves, 1]]
+        return board, moves, (None if winner < 0 else int(winner))
+    
+    def is_terminal(self, state: np.ndarray, last_move: Optional[int] = None) -> bool:
         """
         Check if the game is over.
         
         Args:
             state: The game state to check
+            last_move: The column of the piece that produced this state, if
+                known. Only the lines through that piece are then checked for a win.
             
         Returns:
             True if the game is over, False otherwise
         """
         # Check if there's a winner
-        if self.get_winner(state) is not None:
+        if last_move is not None:
+            # The last piece sits on top of its column
+            row = self._rows - np.count_nonzero(state[:, last_move])
+            winner = self.get_winner_after(state, row, last_move) if row < self._rows else None
+        else:
+            winner = self.get_winner(state)
+        if winner is not None:
             return True
         
-        # Check if the board is full
-        return len(self.get_legal_moves(state, 0)) == 0
+        # Check if the board is full, i.e. every column's top cell is taken
+        return 0 not in state[0].tolist()
+    
+    def get_winner_after(self, state: np.ndarray, row: int, col: int) -> Optional[int]:
+        """
+        Check whether the piece at (row, col) completes a winning line.
+        
+        Only the four lines through the cell are walked, so this is much cheaper
+        than get_winner when the last move is known. A win elsewhere on the
+        board is not detected.
+        
+        Args:
+            state: The game state
+            row: Row of the piece
+            col: Column of the piece
+            
+        Returns:
+            The player number (0-indexed) who owns the piece if it is part of
+            a winning line, or None otherwise
+        """
+        if kernels.wins_at(state, row, col, self._win_length):
+            return int(state[row, col]) - 1
+        return None
     
     def get_winner(self, state: np.ndarray) -> Optional[int]:
         """
         Check if there's a winner.
         
+        Results are cached by state_key, so revisited positions are not
+        scanned again.
+        
         Args:
             state: The game state
             
         Returns:
             The player number (0-indexed) who won, or None if no winner
         """
-        # Check horizontal, vertical, and diagonal lines
-        for player_id in range(1, 3):  # 1 = player 0, 2 = player 1
-            # Horizontal
-            for row in range(self._rows):
-                for col in range(self._cols - self._win_length + 1):
-                    if np.all(state[row, col:col+self._win_length] == player_id):
-                        return player_id - 1  # Convert to 0-indexed player
-            
-            # Vertical
-            for row in range(self._rows - self._win_length + 1):
-                for col in range(self._cols):
-                    if np.all(state[row:row+self._win_length, col] == player_id):
-                        return player_id - 1
-            
-            # Diagonal (down-right)
-            for row in range(self._rows - self._win_length + 1):
-                for col in range(self._cols - self._win_length + 1):
-                    if np.all([state[row+i, col+i] == player_id for i in range(self._win_length)]):
-                        return player_id - 1
-            
-            # Diagonal (up-right)
-            for row in range(self._win_length - 1, self._rows):
-                for col in range(self._cols - self._win_length + 1):
-                    if np.all([state[row-i, col+i] == player_id for i in range(self._win_length)]):
-                        return player_id - 1
+        key = self.state_key(state)
+        cache = self._winner_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
         
-        return None  # No winner
+        winner = self._find_winner(state)
+        cache[key] = winner
+        if len(cache) > WINNER_CACHE_SIZE:
+            cache.popitem(last=False)
+        return winner
+    
+    def _find_winner(self, state: np.ndarray) -> Optional[int]:
+        """Scan the whole board for a winner, bypassing the cache."""
+        # The compiled scan beats packing bitboards when Numba is available
+        if NUMBA_AVAILABLE:
+            winner = kernels.scan_winner(state, self._win_length)
+        else:
+            winner = kernels.bitboard_winner(state, self._win_length)
+        return None if winner < 0 else int(winner)
+    
+    def get_winner_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Get the winner of each board in a batch with vectorized window checks.
+        
+        Args:
+            states: Boards stacked along the leading axes, shape (..., rows, cols)
+            
+        Returns:
+            int8 array with the winning player (0-indexed) of each board, or -1
+            where there is no winner
+        """
+        return kernels.batch_winners(states, self._win_length)
     
     def get_state_representation(self, state: np.ndarray) -> Dict[str, Any]:
         """
@@ -161,33 +274,20 @@ class Connect4(Game):
         Returns:
             A string representation of the board
         """
-        display = ""
+        # Cell strings indexed by cell value
+        cells = ("   ", " X ", " O ")
         
         # Column numbers
-        display += " "
-        for col in range(self._cols):
-            display += f" {col} "
-        display += "\n"
+        lines = [" " + "".join(f" {col} " for col in range(self._cols))]
         
         # Board
-        for row in range(self._rows):
-            display += "|"
-            for col in range(self._cols):
-                if state[row, col] == 0:
-                    display += "   "
-                elif state[row, col] == 1:
-                    display += " X "
-                else:
-                    display += " O "
-            display += "|\n"
+        for values in state.tolist():
+            lines.append("|" + "".join([cells[value] for value in values]) + "|")
         
         # Bottom
-        display += "+"
-        for col in range(self._cols):
-            display += "---"
-        display += "+\n"
+        lines.append("+" + "---" * self._cols + "+")
         
-        return display
+        return "\n".join(lines) + "\n"
     
     def move_to_string(self, move: int) -> str:
         """
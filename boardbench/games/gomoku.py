@@ -1,7 +1,10 @@
 import numpy as np
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any, Tuple
 
-from boardbench.games.base import Game
+from boardbench.games.base import Game, WINNER_CACHE_SIZE
+from boardbench.games import kernels
+from boardbench.utils.jit import NUMBA_AVAILABLE
 
 
 class Gomoku(Game):
@@ -24,6 +27,21 @@ class Gomoku(Game):
         self._board_size = board_size
         self._win_length = win_length
         self._current_player = 0
+        
+        # Copied by reset, which is cheaper than allocating a zeroed board
+        self._empty_state = np.zeros((board_size, board_size), dtype=np.int8)
+        
+        # Winners of recently checked positions, least recently used first
+        self._winner_cache = OrderedDict()
+        
+        # Strings of every on-board move, so the match loop converts moves by lookup
+        self._move_strings = {(row, col): f"{row},{col}"
+                              for row in range(board_size) for col in range(board_size)}
+        self._string_moves = {move_str: move for move, move_str in self._move_strings.items()}
+        
+        if NUMBA_AVAILABLE:
+            # Compile the win scan up front rather than during the first match
+            kernels.scan_winner(np.zeros((1, 1), dtype=np.int8), win_length)
     
     @property
     def name(self) -> str:
@@ -36,7 +54,7 @@ class Gomoku(Game):
     def reset(self) -> np.ndarray:
         """Reset the game to an empty board."""
         # 0 = empty, 1 = player 1, 2 = player 2
-        state = np.zeros((self._board_size, self._board_size), dtype=np.int8)
+        state = self._empty_state.copy()
         self._current_player = 0
         return state
     
@@ -51,10 +69,37 @@ class Gomoku(Game):
         Returns:
             List of (row, column) tuples representing empty positions
         """
-        return [(r, c) for r in range(self._board_size) 
-                for c in range(self._board_size) if state[r, c] == 0]
+        rows, cols = np.nonzero(state == 0)
+        return list(zip(rows.tolist(), cols.tolist()))
     
-    def make_move(self, state: np.ndarray, move: Tuple[int, int], player: int) -> np.ndarray:
+    def count_legal_moves(self, state: np.ndarray, player: int) -> int:
+        """
+        Count the empty positions on the board.
+        
+        Args:
+            state: The current game state
+            player: The player whose turn it is
+            
+        Returns:
+            Number of empty positions
+        """
+        return state.size - int(np.count_nonzero(state))
+    
+    def legal_mask(self, state: np.ndarray, player: int) -> np.ndarray:
+        """
+        Get a boolean mask of the empty positions on the board.
+        
+        Args:
+            state: The current game state
+            player: The player whose turn it is
+            
+        Returns:
+            Boolean array shaped like the board, True where a stone can be placed
+        """
+        return state == 0
+    
+    def make_move(self, state: np.ndarray, move: Tuple[int, int], player: int,
+                  inplace: bool = False) -> np.ndarray:
         """
         Place a stone at the specified position.
         
@@ -62,41 +107,94 @@ class Gomoku(Game):
             state: The current game state
             move: The (row, column) position to place the stone
             player: The player making the move
+            inplace: If True, modify and return the given state instead of a copy
             
         Returns:
             The new state after the move
         """
-        new_state = state.copy()
         row, col = move
         
-        # Validate move
-        if not (0 <= row < self._board_size and 0 <= col < self._board_size):
+        # Validate move against the original board, so rejected moves never copy it
+        size = self._board_size
+        if not (0 <= row < size and 0 <= col < size):
             raise ValueError(f"Position ({row}, {col}) is out of bounds")
         
-        if new_state[row, col] != 0:
+        if state.item(row, col) != 0:
             raise ValueError(f"Position ({row}, {col}) is already occupied")
         
         # Place the stone (player number + 1)
+        new_state = state if inplace else state.copy()
         new_state[row, col] = player + 1
         
         return new_state
     
-    def is_terminal(self, state: np.ndarray) -> bool:
+    def make_move_inplace(self, state: np.ndarray, move: Tuple[int, int], player: int) -> None:
+        """
+        Place a stone by modifying the state in place.
+        
+        Unlike make_move, bounds are not checked, so the move must be on the
+        board.
+        
+        Args:
+            state: The game state, modified in place
+            move: The (row, column) position to place the stone
+            player: The player making the move
+        """
+        if state[move] != 0:
+            raise ValueError(f"Position {move} is already occupied")
+        state[move] = player + 1
+    
+    def undo_move(self, state: np.ndarray, move: Tuple[int, int]) -> None:
+        """
+        Remove the stone placed by make_move_inplace.
+        
+        Args:
+            state: The game state, modified in place
+            move: The (row, column) position of the stone
+        """
+        state[move] = 0
+    
+    def random_playout(self, state: np.ndarray, max_moves: int,
+                       seed: int) -> Tuple[np.ndarray, List[Tuple[int, int]], Optional[int]]:
+        """
+        Play uniformly random moves for both players with a compiled kernel.
+        
+        Args:
+            state: The starting state, which must not be terminal
+            max_moves: Maximum number of moves to play
+            seed: Seed for the random number generator
+            
+        Returns:
+            The final state, the moves played in order, and the winner
+            (None if no winner)
+        """
+        board = state.copy()
+        cells, num_moves, winner = kernels.random_playout(board, self._win_length, False, max_moves, seed)
+        moves = [(int(row), int(col)) for row, col in cells[:num_moves]]
+        return board, moves, (None if winner < 0 else int(winner))
+    
+    def is_terminal(self, state: np.ndarray, last_move: Optional[Tuple[int, int]] = None) -> bool:
         """
         Check if the game is over.
         
         Args:
             state: The game state to check
+            last_move: The move that produced this state, if known. Only the
+                lines through it are then checked for a win.
             
         Returns:
             True if the game is over, False otherwise
         """
         # Check if there's a winner
-        if self.get_winner(state) is not None:
+        if last_move is not None:
+            winner = self.get_winner_after(state, *last_move)
+        else:
+            winner = self.get_winner(state)
+        if winner is not None:
             return True
         
         # Check if the board is full
-        return len(self.get_legal_moves(state, 0)) == 0
+        return np.count_nonzero(state) == state.size
     
     def _check_line(self, state: np.ndarray, start_row: int, start_col: int, 
                    row_dir: int, col_dir: int, player_id: int) -> bool:
@@ -119,43 +217,72 @@ class Gomoku(Game):
         
         return False
     
+    def get_winner_after(self, state: np.ndarray, row: int, col: int) -> Optional[int]:
+        """
+        Check whether the stone at (row, col) completes a winning line.
+        
+        Only the four lines through the cell are walked, so this is much cheaper
+        than get_winner when the last move is known. A win elsewhere on the
+        board is not detected.
+        
+        Args:
+            state: The game state
+            row: Row of the stone
+            col: Column of the stone
+            
+        Returns:
+            The player number (0-indexed) who owns the stone if it is part of
+            a winning line, or None otherwise
+        """
+        if kernels.wins_at(state, row, col, self._win_length):
+            return int(state[row, col]) - 1
+        return None
+    
     def get_winner(self, state: np.ndarray) -> Optional[int]:
         """
         Check if there's a winner.
         
+        Results are cached by state_key, so revisited positions are not
+        scanned again.
+        
         Args:
             state: The game state
             
         Returns:
             The player number (0-indexed) who won, or None if no winner
         """
-        # Check for wins in all directions
-        for player_id in range(1, 3):  # 1 = player 0, 2 = player 1
-            # Check rows
-            for row in range(self._board_size):
-                for col in range(self._board_size - self._win_length + 1):
-                    if np.all(state[row, col:col+self._win_length] == player_id):
-                        return player_id - 1
-            
-            # Check columns
-            for col in range(self._board_size):
-                for row in range(self._board_size - self._win_length + 1):
-                    if np.all(state[row:row+self._win_length, col] == player_id):
-                        return player_id - 1
-            
-            # Check diagonals (top-left to bottom-right)
-            for row in range(self._board_size - self._win_length + 1):
-                for col in range(self._board_size - self._win_length + 1):
-                    if np.all([state[row+i, col+i] == player_id for i in range(self._win_length)]):
-                        return player_id - 1
-            
-            # Check diagonals (bottom-left to top-right)
-            for row in range(self._win_length - 1, self._board_size):
-                for col in range(self._board_size - self._win_length + 1):
-                    if np.all([state[row-i, col+i] == player_id for i in range(self._win_length)]):
-                        return player_id - 1
+        key = self.state_key(state)
+        cache = self._winner_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        winner = self._find_winner(state)
+        cache[key] = winner
+        if len(cache) > WINNER_CACHE_SIZE:
+            cache.popitem(last=False)
+        return winner
+    
+    def _find_winner(self, state: np.ndarray) -> Optional[int]:
+        """Scan the whole board for a winner, bypassing the cache."""
+        if NUMBA_AVAILABLE:
+            winner = kernels.scan_winner(state, self._win_length)
+        else:
+            winner = kernels.bitboard_winner(state, self._win_length)
+        return None if winner < 0 else int(winner)
+    
+    def get_winner_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Get the winner of each board in a batch with vectorized window checks.
         
-        return None  # No winner
+        Args:
+            states: Boards stacked along the leading axes, shape (..., rows, cols)
+            
+        Returns:
+            int8 array with the winning player (0-indexed) of each board, or -1
+            where there is no winner
+        """
+        return kernels.batch_winners(states, self._win_length)
     
     def get_state_representation(self, state: np.ndarray) -> Dict[str, Any]:
         """
@@ -183,30 +310,20 @@ class Gomoku(Game):
         Returns:
             A string representation of the board
         """
-        # Unicode characters for the board
+        # Unicode characters for the board, indexed by cell value
         EMPTY = "·"  # Middle dot
         BLACK = "○"  # White circle
         WHITE = "●"  # Black circle
+        cells = (f" {EMPTY}", f" {BLACK}", f" {WHITE}")
         
-        display = "  "
         # Column headers (numbers)
-        for col in range(self._board_size):
-            display += f"{col:2d}"
-        display += "\n"
+        lines = ["  " + "".join(f"{col:2d}" for col in range(self._board_size))]
         
         # Board with row numbers
-        for row in range(self._board_size):
-            display += f"{row:2d}"
-            for col in range(self._board_size):
-                if state[row, col] == 0:
-                    display += f" {EMPTY}"
-                elif state[row, col] == 1:
-                    display += f" {BLACK}"
-                else:
-                    display += f" {WHITE}"
-            display += "\n"
-        
-        return display
+        for row, values in enumerate(state.tolist()):
+            lines.append(f"{row:2d}" + "".join([cells[value] for value in values]))
+        
+        return "\n".join(lines) + "\n"
     
     def move_to_string(self, move: Tuple[int, int]) -> str:
         """
@@ -218,8 +335,11 @@ class Gomoku(Game):
         Returns:
             String representation of the move
         """
-        row, col = move
-        return f"{row},{col}"
+        move_str = self._move_strings.get(move)
+        if move_str is None:  # Off-board moves, e.g. invalid moves being reported
+            row, col = move
+            move_str = f"{row},{col}"
+        return move_str
     
     def string_to_move(self, move_str: str) -> Tuple[int, int]:
         """
@@ -231,6 +351,10 @@ class Gomoku(Game):
         Returns:
             The move as (row, col)
         """
+        move = self._string_moves.get(move_str)
+        if move is not None:
+            return move
+        
         try:
             parts = move_str.split(",")
             if len(parts) != 2:
@@ -0,0 +1,305 @@
+"""
+Compiled kernels shared by the k-in-a-row grid games (Gomoku and Connect4).
+
+Boards are 2D int8 arrays where 0 is empty and player p is stored as p + 1.
+The kernels are compiled with Numba when it is installed and run as plain
+Python otherwise. The bitboard helpers and batch_winners are plain NumPy.
+"""
+
+import numpy as np
+
+from boardbench.utils.jit import njit
+
+
+@njit(cache=True)
+def wins_at(board, row, col, win_length):
+    """
+    Check whether the stone at (row, col) is part of a line of win_length.
+    
+    Only the four lines through the given cell are walked, so this is the
+    cheap check to run after placing a stone.
+    """
+    player_id = board[row, col]
+    if player_id == 0:
+        return False
+    
+    rows, cols = board.shape
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        
+        r, c = row + dr, col + dc
+        while 0 <= r < rows and 0 <= c < cols and board[r, c] == player_id:
+            count += 1
+            r += dr
+            c += dc
+        
+        r, c = row - dr, col - dc
+        while 0 <= r < rows and 0 <= c < cols and board[r, c] == player_id:
+            count += 1
+            r -= dr
+            c -= dc
+        
+        if count >= win_length:
+            return True
+    
+    return False
+
+
+@njit(cache=True)
+def _has_run(board, row, col, dr, dc, player_id, win_length):
+    """Walk from (row, col) in direction (dr, dc) looking for win_length in a row."""
+    rows, cols = board.shape
+    count = 0
+    while 0 <= row < rows and 0 <= col < cols:
+        if board[row, col] == player_id:
+            count += 1
+            if count >= win_length:
+                return True
+        else:
+            count = 0
+        row += dr
+        col += dc
+    return False
+
+
+@njit(cache=True)
+def _row_mask_winner(board, win_length):
+    """
+    Find a line of win_length using one bit mask per row and player.
+    
+    Bit col of a row mask is set where the player has a stone, so a whole
+    row is checked with win_length - 1 shift-and-AND steps. Vertical and
+    diagonal lines AND the masks of consecutive rows, shifted by the row
+    offset for diagonals. Only boards with at most 64 columns fit.
+    """
+    rows, cols = board.shape
+    masks = np.zeros((2, rows), dtype=np.uint64)
+    for row in range(rows):
+        for col in range(cols):
+            player_id = board[row, col]
+            if player_id != 0:
+                masks[player_id - 1, row] |= np.uint64(1) << np.uint64(col)
+    
+    for player in range(2):
+        player_masks = masks[player]
+        for row in range(rows):
+            line = player_masks[row]
+            for step in range(1, win_length):
+                line &= player_masks[row] >> np.uint64(step)
+            if line:
+                return player
+        
+        for row in range(rows - win_length + 1):
+            vertical = player_masks[row]
+            falling = player_masks[row]
+            rising = player_masks[row]
+            for step in range(1, win_length):
+                below = player_masks[row + step]
+                vertical &= below
+                falling &= below >> np.uint64(step)
+                # Bits shifted past the last column are cleared by the AND
+                rising &= below << np.uint64(step)
+            if vertical or falling or rising:
+                return player
+    
+    return -1
+
+
+@njit(cache=True)
+def scan_winner(board, win_length):
+    """
+    Scan the whole board for a line of win_length.
+    
+    Boards up to 64 columns wide are checked with row bit masks. Wider
+    boards walk every row, column and diagonal once with a run counter.
+    Player 0 is checked first, so it is reported if both players have a line.
+    
+    Returns:
+        The winning player (0-indexed), or -1 if nobody has a line
+    """
+    rows, cols = board.shape
+    if cols <= 64:
+        return _row_mask_winner(board, win_length)
+    
+    for player_id in range(1, 3):
+        for row in range(rows):
+            if _has_run(board, row, 0, 0, 1, player_id, win_length):
+                return player_id - 1
+        for col in range(cols):
+            if _has_run(board, 0, col, 1, 0, player_id, win_length):
+                return player_id - 1
+        
+        # Diagonals start on the top row or on the left/right column
+        for col in range(cols):
+            if (_has_run(board, 0, col, 1, 1, player_id, win_length)
+                    or _has_run(board, 0, col, 1, -1, player_id, win_length)):
+                return player_id - 1
+        for row in range(1, rows):
+            if (_has_run(board, row, 0, 1, 1, player_id, win_length)
+                    or _has_run(board, row, cols - 1, 1, -1, player_id, win_length)):
+                return player_id - 1
+    
+    return -1
+
+
+def pack_bitboards(board):
+    """
+    Pack the board into one integer bitboard per player.
+    
+    Cell (row, col) becomes bit row * (cols + 1) + col. The extra bit at the
+    end of each row is always clear, so shifted lines never wrap from one row
+    into the next.
+    
+    Args:
+        board: The board to pack
+    
+    Returns:
+        Tuple of (player 0 bitboard, player 1 bitboard)
+    """
+    rows, cols = board.shape
+    cells = np.zeros((2, rows, cols + 1), dtype=bool)
+    cells[0, :, :cols] = board == 1
+    cells[1, :, :cols] = board == 2
+    packed = np.packbits(cells.reshape(2, -1), axis=1, bitorder="little")
+    return (int.from_bytes(packed[0].tobytes(), "little"),
+            int.from_bytes(packed[1].tobytes(), "little"))
+
+
+def bitboard_winner(board, win_length):
+    """
+    Find the winner with shift-and-AND checks on packed bitboards.
+    
+    This is the alternative to scan_winner for when Numba is not installed:
+    each direction costs win_length - 1 big-integer operations instead of a
+    walk over every cell.
+    
+    Args:
+        board: The board to check
+        win_length: Number of connected stones needed to win
+    
+    Returns:
+        The winning player (0-indexed), or -1 if nobody has a line. Player 0
+        is reported if both players have a line.
+    """
+    width = board.shape[1] + 1
+    shifts = (1, width, width + 1, width - 1)  # Horizontal, vertical, both diagonals
+    for player, bitboard in enumerate(pack_bitboards(board)):
+        for shift in shifts:
+            # Bit i of line survives only if bits i, i + shift, ... are all set
+            line = bitboard
+            for step in range(1, win_length):
+                line &= bitboard >> (shift * step)
+            if line:
+                return player
+    return -1
+
+
+@njit(cache=True)
+def random_playout(board, win_length, gravity, max_moves, seed):
+    """
+    Play uniformly random moves for both players, starting with player 0.
+    
+    The board is modified in place. Play stops when a player completes a line,
+    the board is full, or max_moves have been made.
+    
+    Args:
+        board: The starting board (must not already be won)
+        win_length: Number of connected stones needed to win
+        gravity: If True, moves are columns and stones drop to the lowest
+            empty row (Connect4); otherwise any empty cell may be taken (Gomoku)
+        max_moves: Maximum number of moves to play
+        seed: Seed for the random number generator
+    
+    Returns:
+        Tuple of (cells, num_moves, winner) where cells[:num_moves] holds the
+        (row, col) of each placed stone and winner is -1 if nobody won
+    """
+    np.random.seed(seed)
+    rows, cols = board.shape
+    cells = np.empty((max_moves, 2), dtype=np.int32)
+    candidates = np.empty(rows * cols, dtype=np.int32)
+    
+    player = 0
+    num_moves = 0
+    while num_moves < max_moves:
+        count = 0
+        if gravity:
+            for c in range(cols):
+                if board[0, c] == 0:
+                    candidates[count] = c
+                    count += 1
+        else:
+            for r in range(rows):
+                for c in range(cols):
+                    if board[r, c] == 0:
+                        candidates[count] = r * cols + c
+                        count += 1
+        
+        if count == 0:
+            break
+        
+        choice = candidates[np.random.randint(0, count)]
+        if gravity:
+            col = choice
+            row = rows - 1
+            while board[row, col] != 0:
+                row -= 1
+        else:
+            row = choice // cols
+            col = choice % cols
+        
+        board[row, col] = player + 1
+        cells[num_moves, 0] = row
+        cells[num_moves, 1] = col
+        num_moves += 1
+        
+        if wins_at(board, row, col, win_length):
+            return cells, num_moves, player
+        
+        player = 1 - player
+    
+    return cells, num_moves, -1
+
+
+def batch_winners(states, win_length):
+    """
+    Find the winner of every board in a stack at once.
+    
+    For each direction, a player's stones are ANDed with win_length - 1
+    shifted slices of themselves, which leaves a cell set only where a full
+    window starts there. The work is a few whole-array operations however
+    many boards there are.
+    
+    Args:
+        states: Array of boards with shape (..., rows, cols)
+        win_length: Number of connected stones needed to win
+    
+    Returns:
+        int8 array of shape states.shape[:-2] holding the winning player
+        (0-indexed) of each board, or -1 where nobody has a line. Player 0
+        is reported if both players have a line.
+    """
+    states = np.asarray(states)
+    rows, cols = states.shape[-2:]
+    batch_shape = states.shape[:-2]
+    span = win_length - 1
+    
+    winners = np.full(batch_shape, -1, dtype=np.int8)
+    for player_id in (2, 1):  # Player 0 last so it takes precedence
+        stones = states == player_id
+        has_line = np.zeros(batch_shape, dtype=bool)
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            # Window starts must leave room for the rest of the line
+            height = rows - dr * span
+            width = cols - abs(dc) * span
+            if height <= 0 or width <= 0:
+                continue
+            first_col = span if dc < 0 else 0
+            line = stones[..., :height, first_col:first_col + width].copy()
+            for step in range(1, win_length):
+                row, col = dr * step, first_col + dc * step
+                line &= stones[..., row:row + height, col:col + width]
+            has_line |= line.reshape(batch_shape + (-1,)).any(axis=-1)
+        winners[has_line] = player_id - 1
+    
+    return winners
@@ -0,0 +1,16 @@
+# Import optional Numba dependency - kernels run as plain Python if not installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit that returns the decorated function unchanged.
+        
+        Supports both the bare ``@njit`` and the ``@njit(cache=True)`` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
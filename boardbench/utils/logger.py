@@ -1,7 +1,78 @@
 import os
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import pickle
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, BinaryIO
+
+# Import optional orjson dependency - fall back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Import optional zstandard dependency - needed only for binary match logs
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Extension of compressed pickle match logs, which read_match detects
+BINARY_LOG_EXTENSION = ".pkl.zst"
+
+# File in the log directory that log_match_stream appends to
+MATCH_STREAM_FILENAME = "matches.ndjson"
+
+# Write buffer of the match stream, so most matches cost no system call
+MATCH_STREAM_BUFFER_SIZE = 1 << 20
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert values the JSON encoder can't handle natively, such as numpy arrays and sets."""
+    if hasattr(obj, 'tolist'):  # Numpy arrays and scalars
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_line(data: Dict[str, Any]) -> bytes:
+    """Serialize a record as a single line of JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, default=_json_default) + "\n").encode("utf-8")
+
+
+def _json_document(data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Serialize a record as compact JSON, or indented for reading if pretty is set."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, default=_json_default, option=option)
+    if pretty:
+        return json.dumps(data, default=_json_default, indent=2).encode("utf-8")
+    return json.dumps(data, default=_json_default, separators=(',', ':')).encode("utf-8")
+
+
+def _write_atomic(filepath: str, payload: bytes) -> None:
+    """Write a file in one go through a temporary file, so readers never see a partial log."""
+    # A unique temporary file per write, so concurrent writers don't share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or ".", suffix=".tmp")
+    try:
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 class Logger:
@@ -11,71 +82,172 @@ class Logger:
     Handles saving match data to JSON files for later analysis.
     """
     
-    def __init__(self, log_dir: str):
+    def __init__(self, log_dir: str, pretty: bool = False):
         """
         Initialize the logger.
         
         Args:
             log_dir: The directory where logs will be saved
+            pretty: If True, indent match logs for reading; otherwise write
+                compact JSON, which is faster to produce and parse
         """
         self.log_dir = log_dir
+        self.pretty = pretty
+        
+        # Open per-match move logs, keyed by match ID
+        self._move_streams: Dict[str, BinaryIO] = {}
+        
+        # Shared NDJSON file of log_match_stream, opened on first use
+        self._match_stream: Optional[BinaryIO] = None
         
         # Create the log directory if it doesn't exist
         os.makedirs(log_dir, exist_ok=True)
     
-    def log_match(self, match_data: Dict[str, Any]) -> str:
+    def log_move(self, match_id: str, move_data: Dict[str, Any]) -> None:
+        """
+        Append a single move to the match's JSON Lines move log.
+        
+        The file is opened on the first move and kept open until the match
+        itself is logged with log_match.
+        
+        Args:
+            match_id: The ID of the match the move belongs to
+            move_data: Dictionary describing the move
+        """
+        stream = self._move_streams.get(match_id)
+        if stream is None:
+            filepath = os.path.join(self.log_dir, f"{match_id}_moves.jsonl")
+            stream = open(filepath, 'ab')
+            self._move_streams[match_id] = stream
+        
+        stream.write(_json_line(move_data))
+    
+    def log_match(self, match_data: Dict[str, Any], binary: bool = False) -> str:
         """
         Log a match to a JSON file.
         
         Args:
             match_data: Dictionary containing match data
+            binary: If True, write a zstd-compressed pickle instead of JSON.
+                Numpy arrays are stored as-is, which is much smaller and
+                faster for full replay traces, but the file is only readable
+                from Python.
             
         Returns:
             The path to the log file
         """
-        # Generate a filename based on the match ID and date
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if binary and not ZSTD_AVAILABLE:
+            raise ImportError("zstandard package is required for binary logs. Install with: pip install zstandard")
+        
+        # Generate a filename based on the match ID and a nanosecond timestamp,
+        # which sorts chronologically and is cheaper than formatting a date
+        timestamp = time.time_ns()
         game_name = match_data.get("game", "unknown")
         match_id = match_data.get("match_id", "unknown")
         
-        filename = f"{timestamp}_{game_name}_{match_id}.json"
+        extension = BINARY_LOG_EXTENSION if binary else ".json"
+        filename = f"{timestamp}_{game_name}_{match_id}{extension}"
         filepath = os.path.join(self.log_dir, filename)
         
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        match_data = self._close_move_log(match_data)
+        
+        if binary:
+            payload = zstandard.ZstdCompressor(level=3).compress(pickle.dumps(match_data, protocol=5))
+        else:
+            # Numpy arrays are serialized straight from their buffers when orjson is installed
+            payload = _json_document(match_data, self.pretty)
+        _write_atomic(filepath, payload)
         
-        # Convert numpy arrays to lists for JSON serialization
-        # This function recursively processes dictionaries and lists
-        def prepare_for_json(obj: Any) -> Any:
-            if isinstance(obj, dict):
-                return {k: prepare_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [prepare_for_json(item) for item in obj]
-            elif hasattr(obj, 'tolist'):  # Handle numpy arrays
-                return obj.tolist()
-            else:
-                return obj
+        return filepath
+    
+    def log_match_stream(self, match_data: Dict[str, Any]) -> str:
+        """
+        Append a match to the log directory's shared NDJSON file.
         
-        # Prepare the data for serialization
-        json_data = prepare_for_json(match_data)
+        Unlike log_match, every match goes to one file that stays open and
+        buffered, one JSON object per line. Call close to flush it.
         
-        # Write to the file
-        with open(filepath, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        Args:
+            match_data: Dictionary containing match data
+            
+        Returns:
+            The path to the NDJSON file
+        """
+        if self._match_stream is None:
+            self._match_stream = open(os.path.join(self.log_dir, MATCH_STREAM_FILENAME), 'ab',
+                                      buffering=MATCH_STREAM_BUFFER_SIZE)
         
-        return filepath
+        self._match_stream.write(_json_line(self._close_move_log(match_data)))
+        return self._match_stream.name
+    
+    def close(self) -> None:
+        """Flush and close the match stream and any move logs still open."""
+        if self._match_stream is not None:
+            self._match_stream.close()
+            self._match_stream = None
+        for stream in self._move_streams.values():
+            stream.close()
+        self._move_streams.clear()
+    
+    def __enter__(self) -> "Logger":
+        """Use the logger in a with block, which closes it on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the logger, flushing any buffered matches."""
+        self.close()
+    
+    def _close_move_log(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Close the match's move log, if moves were streamed, and reference it in the match data."""
+        stream = self._move_streams.pop(match_data.get("match_id", "unknown"), None)
+        if stream is None:
+            return match_data
+        stream.close()
+        return {**match_data, "moves_log": stream.name}
     
     def read_match(self, filepath: str) -> Dict[str, Any]:
         """
         Read a match log from a file.
         
+        Binary logs written with log_match(binary=True) are recognized by
+        their extension. They are unpickled, so only read logs you trust.
+        
         Args:
             filepath: Path to the log file
             
         Returns:
             Dictionary containing the match data
         """
-        with open(filepath, 'r') as f:
-            match_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        
+        if filepath.endswith(BINARY_LOG_EXTENSION):
+            if not ZSTD_AVAILABLE:
+                raise ImportError("zstandard package is required for binary logs. Install with: pip install zstandard")
+            return pickle.loads(zstandard.ZstdDecompressor().decompress(data))
+        
+        # orjson's decode errors subclass json.JSONDecodeError, so callers see the same exception
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    def read_match_stream(self, filepath: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Read every match from an NDJSON file written by log_match_stream.
+        
+        Args:
+            filepath: Path to the NDJSON file; defaults to this logger's file
+            
+        Returns:
+            List of match data dictionaries, in the order they were logged
+        """
+        if filepath is None:
+            filepath = os.path.join(self.log_dir, MATCH_STREAM_FILENAME)
+        if self._match_stream is not None and os.path.abspath(filepath) == os.path.abspath(self._match_stream.name):
+            self._match_stream.flush()
+        
+        with open(filepath, 'rb') as f:
+            lines = f.read().splitlines()
         
-        return match_data
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        return [loads(line) for line in lines if line]
@@ -8,6 +8,8 @@ import os
 import sys
 import pytest
 import numpy as np
+from types import SimpleNamespace
+from unittest.mock import patch
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -19,13 +21,61 @@ from boardbench.agents.base import Agent
 from boardbench.agents.random_agent import RandomAgent
 
 
+class StubGame:
+    """
+    Minimal stand-in for a game, exposing only what MatchRunner calls.
+    
+    Plain methods keep match-loop tests fast compared to a MagicMock game.
+    Moving to (9, 9) is rejected as invalid; every other move leaves the
+    board unchanged.
+    """
+    
+    name = "MockGame"
+    num_players = 2
+    
+    def __init__(self, state):
+        self._state = state
+    
+    def reset(self):
+        return self._state
+    
+    def is_terminal(self, state, last_move=None):
+        return False
+    
+    def get_legal_moves(self, state, player):
+        return [(0, 0), (0, 1)]
+    
+    def make_move(self, state, move, player):
+        if move == (9, 9):
+            raise ValueError("Invalid move")
+        return state
+    
+    def get_winner(self, state):
+        return 0
+    
+    def move_to_string(self, move):
+        return "A1"
+    
+    def get_state_representation(self, state):
+        return {"board": state.tolist()}
+    
+    def display_state(self, state):
+        return "Mock Board Display"
+
+
 @pytest.fixture
+def stub_game():
+    """Return a StubGame on an empty 3x3 board."""
+    return StubGame(np.zeros((3, 3), dtype=np.int8))
+
+
+@pytest.fixture(scope="session")
 def gomoku_game():
     """Return a standard 15x15 Gomoku game instance."""
     return Gomoku(board_size=15, win_length=5)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def small_gomoku_game():
     """Return a small 5x5 Gomoku game instance for faster testing."""
     return Gomoku(board_size=5, win_length=3)
@@ -37,16 +87,20 @@ def random_agent():
     return RandomAgent(name="TestRandomAgent", seed=42)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_board_5x5():
-    """Return an empty 5x5 board."""
-    return np.zeros((5, 5), dtype=np.int8)
+    """Return a read-only empty 5x5 board; copy it before making changes."""
+    board = np.zeros((5, 5), dtype=np.int8)
+    board.flags.writeable = False
+    return board
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_board_15x15():
-    """Return an empty 15x15 board."""
-    return np.zeros((15, 15), dtype=np.int8)
+    """Return a read-only empty 15x15 board; copy it before making changes."""
+    board = np.zeros((15, 15), dtype=np.int8)
+    board.flags.writeable = False
+    return board
 
 
 @pytest.fixture
@@ -72,8 +126,7 @@ def diagonal_win_board_5x5():
     """Return a 5x5 board with a diagonal win for player 1."""
     board = np.zeros((5, 5), dtype=np.int8)
     # Player 1 has 3 in a diagonal
-    for i in range(3):
-        board[i, i] = 1
+    board[np.arange(3), np.arange(3)] = 1
     return board
 
 
@@ -81,8 +134,25 @@ def diagonal_win_board_5x5():
 def full_board_5x5():
     """Return a full 5x5 board with no winner (draw)."""
     # Alternating pattern of 1s and 2s with no winning line
-    board = np.zeros((5, 5), dtype=np.int8)
-    for i in range(5):
-        for j in range(5):
-            board[i, j] = ((i + j) % 2) + 1
-    return board
+    return (np.add.outer(np.arange(5), np.arange(5)) % 2 + 1).astype(np.int8)
+
+
+@pytest.fixture(scope="session")
+def openai_client_class():
+    """
+    Patch the OpenAI client class once for the whole session.
+    
+    Tests get the shared client instance through fixtures that reset it,
+    rather than entering a new patch for every test.
+    """
+    with patch('openai.OpenAI') as mock_client:
+        yield mock_client
+
+
+@pytest.fixture(scope="session")
+def llm_completion():
+    """Return a factory for chat completion responses with the given content."""
+    def make_completion(content):
+        # Plain namespaces are much cheaper to build than Mock trees
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    return make_completion
@@ -3,6 +3,43 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 
 from boardbench.agents.enforced_random_agent import EnforcedRandomAgent
+from boardbench.games.base import Game
+
+
+class ColumnGame(Game):
+    """Game on a 3x4 board whose moves are column numbers, relying on the default legal_mask."""
+    
+    name = "ColumnGame"
+    num_players = 2
+    
+    def reset(self):
+        return np.zeros((3, 4), dtype=np.int8)
+    
+    def get_legal_moves(self, state, player):
+        return [col for col in range(state.shape[1]) if state[0, col] == 0]
+    
+    def make_move(self, state, move, player, inplace=False):
+        if state[0, move] != 0:
+            raise ValueError("Column is full")
+        return state
+    
+    def is_terminal(self, state, last_move=None):
+        return False
+    
+    def get_winner(self, state):
+        return None
+    
+    def get_state_representation(self, state):
+        return {"board": state.tolist()}
+    
+    def display_state(self, state):
+        return str(state)
+    
+    def move_to_string(self, move):
+        return str(move)
+    
+    def string_to_move(self, move_str):
+        return int(move_str)
 
 
 class TestEnforcedRandomAgent(unittest.TestCase):
@@ -26,15 +63,15 @@ class TestEnforcedRandomAgent(unittest.TestCase):
         legal_moves = [(0, 0), (0, 1), (1, 1)]
         
         # All moves are considered valid in test state
-        self.game.make_move.return_value = self.state
+        self.game.legal_mask.return_value = np.ones((3, 3), dtype=bool)
         
         move = self.agent.make_move(self.game, self.state, legal_moves, self.player)
         
         # The move should be one of the legal moves
         self.assertIn(move, legal_moves)
         
-        # The game's make_move should have been called for validation
-        self.game.make_move.assert_called()
+        # The game's legality mask should have been used for validation
+        self.game.legal_mask.assert_called_once_with(self.state, self.player)
 
     def test_make_move_with_empty_move_list(self):
         """Test handling empty move list."""
@@ -45,18 +82,14 @@ class TestEnforcedRandomAgent(unittest.TestCase):
         """Test filtering out invalid moves during validation."""
         legal_moves = [(0, 0), (0, 1), (1, 1), (2, 2)]
         
-        # Make (1,1) and (2,2) invalid moves that raise ValueError
-        def mock_make_move(state, move, player):
-            if move in [(1, 1), (2, 2)]:
-                raise ValueError("Invalid move")
-            return state
+        # Mark (1,1) and (2,2) as illegal in the game's mask
+        mask = np.ones((3, 3), dtype=bool)
+        mask[1, 1] = False
+        mask[2, 2] = False
+        self.game.legal_mask.return_value = mask
         
-        self.game.make_move.side_effect = mock_make_move
+        move = self.agent.make_move(self.game, self.state, legal_moves, self.player)
         
-        # Patch random.choice to always return the first option
-        with patch('random.choice', return_value=(0, 0)):
-            move = self.agent.make_move(self.game, self.state, legal_moves, self.player)
-            
         # The move should be one of the valid moves
         self.assertIn(move, [(0, 0), (0, 1)])
         self.assertNotIn(move, [(1, 1), (2, 2)])
@@ -65,20 +98,37 @@ class TestEnforcedRandomAgent(unittest.TestCase):
         """Test case where all moves are invalid after validation."""
         legal_moves = [(0, 0), (0, 1)]
         
-        # Make all moves raise ValueError
-        def mock_make_move(state, move, player):
-            raise ValueError("Invalid move")
-        
-        self.game.make_move.side_effect = mock_make_move
+        # Mark every position as illegal
+        self.game.legal_mask.return_value = np.zeros((3, 3), dtype=bool)
         
         with self.assertRaises(ValueError):
             self.agent.make_move(self.game, self.state, legal_moves, self.player)
 
+    def test_make_move_filters_out_of_bounds_moves(self):
+        """Test that moves outside the mask are filtered instead of wrapping around."""
+        legal_moves = [(-1, 0), (3, 3), (2, 2)]
+        self.game.legal_mask.return_value = np.ones((3, 3), dtype=bool)
+        
+        move = self.agent.make_move(self.game, self.state, legal_moves, self.player)
+        
+        self.assertEqual(move, (2, 2))
+
+    def test_make_move_simulates_moves_without_a_legality_mask(self):
+        """Test that games using the default mask are checked by simulating their moves."""
+        game = ColumnGame()
+        state = game.reset()
+        state[0, 1] = 1  # Column 1 is full
+        
+        moves = {self.agent.make_move(game, state, [0, 1, 2, 3], self.player) for _ in range(20)}
+        
+        self.assertTrue(moves)
+        self.assertTrue(moves <= {0, 2, 3})
+
     def test_move_feedback(self):
         """Test move feedback handling."""
         # Prepare test data
         game = MagicMock()
-        state = np.zeros((3, 3))
+        state = self.state
         move = (0, 0)
         
         # Test successful move feedback
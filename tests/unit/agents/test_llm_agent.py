@@ -4,32 +4,39 @@ Unit tests for the LLMAgent implementation.
 
 import pytest
 import numpy as np
-from unittest.mock import MagicMock, patch, Mock
+from unittest.mock import patch
 
-from boardbench.agents.llm_agent import LLMAgent, OPENAI_AVAILABLE
-from boardbench.games.gomoku import Gomoku
+# Skip all tests if OpenAI is not installed
+pytest.importorskip("openai", reason="OpenAI package is not installed")
 
+from boardbench.agents.llm_agent import LLMAgent
 
-# Skip all tests if OpenAI is not installed
-pytestmark = pytest.mark.skipif(not OPENAI_AVAILABLE, reason="OpenAI package is not installed")
+pytestmark = pytest.mark.llm
+
+# Legal move lists shared by the tests; the agent only reads them
+ROW_MOVES = ((0, 0), (0, 1), (0, 2))
+DIAGONAL_MOVES = ((0, 0), (1, 1), (2, 2))
+
+
+@pytest.fixture(scope="module")
+def parsing_agent(openai_client_class):
+    """Return one agent shared by the response parsing cases."""
+    return LLMAgent(name="TestLLM")
 
 
 class TestLLMAgent:
     """Test the functionality of the LLM agent."""
     
     @pytest.fixture
-    def mock_openai_client(self):
-        """Create a mock OpenAI client."""
-        with patch('openai.OpenAI') as mock_client:
-            # Configure the mock to return a specific response when called
-            mock_instance = mock_client.return_value
-            mock_completion = Mock()
-            mock_completion.choices = [Mock()]
-            mock_completion.choices[0].message = Mock()
-            mock_completion.choices[0].message.content = "I think move 2 is best because it creates a threat.\n\nMOVE: 2"
-            mock_instance.chat.completions.create.return_value = mock_completion
-            
-            yield mock_instance
+    def mock_openai_client(self, openai_client_class, llm_completion):
+        """Return the shared mock OpenAI client, reset for this test."""
+        mock_instance = openai_client_class.return_value
+        mock_instance.reset_mock(return_value=True, side_effect=True)
+        # Configure the mock to return a specific response when called
+        mock_instance.chat.completions.create.return_value = llm_completion(
+            "I think move 2 is best because it creates a threat.\n\nMOVE: 2"
+        )
+        return mock_instance
     
     def test_initialization(self, mock_openai_client):
         """Test that the LLM agent initializes correctly."""
@@ -47,14 +54,14 @@ class TestLLMAgent:
         
         assert agent._system_prompt == custom_prompt
     
-    def test_make_move_valid_response(self, mock_openai_client, small_gomoku_game, empty_board_5x5):
+    def test_make_move_valid_response(self, mock_openai_client, llm_completion, small_gomoku_game, empty_board_5x5):
         """Test that make_move correctly interprets a valid LLM response."""
         agent = LLMAgent(name="TestLLM")
         
-        legal_moves = [(0, 0), (0, 1), (0, 2)]  # 3 legal moves
+        legal_moves = ROW_MOVES  # 3 legal moves
         
         # Set up the mock response to indicate move index 2
-        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+        mock_openai_client.chat.completions.create.return_value = llm_completion(
             "After analyzing the board, I believe move 2 is best because it creates a threat.\n\nMOVE: 2"
         )
         
@@ -72,14 +79,14 @@ class TestLLMAgent:
         assert call_args["messages"][0]["role"] == "system"
         assert call_args["messages"][1]["role"] == "user"
     
-    def test_make_move_invalid_response(self, mock_openai_client, small_gomoku_game, empty_board_5x5):
+    def test_make_move_invalid_response(self, mock_openai_client, llm_completion, small_gomoku_game, empty_board_5x5):
         """Test that make_move handles invalid responses gracefully."""
         agent = LLMAgent(name="TestLLM")
         
-        legal_moves = [(0, 0), (0, 1), (0, 2)]  # 3 legal moves
+        legal_moves = ROW_MOVES  # 3 legal moves
         
         # Set up the mock with an invalid response
-        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+        mock_openai_client.chat.completions.create.return_value = llm_completion(
             "I'm not sure what move to make. Let me think..."
         )
         
@@ -93,14 +100,14 @@ class TestLLMAgent:
             # Verify API was called
             mock_openai_client.chat.completions.create.assert_called_once()
     
-    def test_make_move_out_of_range_index(self, mock_openai_client, small_gomoku_game, empty_board_5x5):
+    def test_make_move_out_of_range_index(self, mock_openai_client, llm_completion, small_gomoku_game, empty_board_5x5):
         """Test handling of out-of-range move indices."""
         agent = LLMAgent(name="TestLLM")
         
-        legal_moves = [(0, 0), (0, 1)]  # Only 2 legal moves
+        legal_moves = ROW_MOVES[:2]  # Only 2 legal moves
         
         # Set up the mock to return a move index that's out of range
-        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+        mock_openai_client.chat.completions.create.return_value = llm_completion(
             "I'll choose move 5.\n\nMOVE: 5"
         )
         
@@ -111,35 +118,34 @@ class TestLLMAgent:
             # Should select the fallback random move
             assert move == (0, 0)
     
-    def test_api_retry_on_failure(self, small_gomoku_game, empty_board_5x5):
+    def test_api_retry_on_failure(self, mock_openai_client, llm_completion, small_gomoku_game, empty_board_5x5):
         """Test that the agent retries on API failure."""
-        with patch('openai.OpenAI') as mock_client:
-            # Configure the mock instance
-            mock_instance = mock_client.return_value
-            
-            # Make the API fail twice, then succeed
-            mock_instance.chat.completions.create.side_effect = [
-                Exception("API error"),
-                Exception("API error"),
-                Mock(choices=[Mock(message=Mock(content="MOVE: 0"))])
-            ]
-            
-            # Create agent with short retry delay
-            agent = LLMAgent(name="RetryAgent", max_retries=3, retry_delay=0.001)
-            
-            # Call make_move
-            legal_moves = [(0, 0), (0, 1)]
+        # Make the API fail twice, then succeed
+        mock_openai_client.chat.completions.create.side_effect = [
+            Exception("API error"),
+            Exception("API error"),
+            llm_completion("MOVE: 0")
+        ]
+        
+        # Create agent with short retry delay
+        agent = LLMAgent(name="RetryAgent", max_retries=3, retry_delay=0.001)
+        
+        # Call make_move without actually waiting between retries
+        legal_moves = ROW_MOVES[:2]
+        with patch('boardbench.agents.llm_agent.time.sleep') as sleep_mock:
             move = agent.make_move(small_gomoku_game, empty_board_5x5, legal_moves, 0)
-            
-            # Should have retried and eventually succeeded
-            assert move == (0, 0)
-            assert mock_instance.chat.completions.create.call_count == 3
+        
+        # Should have retried and eventually succeeded
+        assert move == (0, 0)
+        assert mock_openai_client.chat.completions.create.call_count == 3
+        sleep_mock.assert_called_with(0.001)
+        assert sleep_mock.call_count == 2
     
     def test_create_prompt(self, mock_openai_client, small_gomoku_game, empty_board_5x5):
         """Test prompt creation logic."""
         agent = LLMAgent(name="TestLLM")
         
-        legal_moves = [(0, 0), (1, 1)]
+        legal_moves = DIAGONAL_MOVES[:2]
         player = 0
         
         prompt = agent._create_prompt(small_gomoku_game, empty_board_5x5, legal_moves, player)
@@ -151,25 +157,43 @@ class TestLLMAgent:
         assert "Move 0:" in prompt
         assert "Move 1:" in prompt
         assert "MOVE: " in prompt  # Instructions for response format
-    
-    def test_parse_response(self, mock_openai_client):
-        """Test parsing of different LLM responses."""
+
+    def test_create_prompt_reuses_rendering(self, mock_openai_client, small_gomoku_game, empty_board_5x5):
+        """Test that board rendering and move strings are cached between prompts."""
         agent = LLMAgent(name="TestLLM")
-        game = Gomoku(board_size=5)
-        legal_moves = [(0, 0), (1, 1), (2, 2)]
-        
-        # Test valid response
-        valid_response = "After careful consideration, I believe the best move is 1.\nMOVE: 1"
-        parsed_move = agent._parse_response(valid_response, game, legal_moves)
-        assert parsed_move == (1, 1)
-        
-        # Test response with different formatting
-        formatted_response = "I will play move:1"
-        parsed_move = agent._parse_response(formatted_response, game, legal_moves)
-        assert parsed_move == (1, 1)
-        
-        # Test invalid response (fallback to random)
-        invalid_response = "I'm not sure what to do."
-        with patch('random.choice', return_value=(2, 2)):
-            parsed_move = agent._parse_response(invalid_response, game, legal_moves)
-            assert parsed_move == (2, 2)
+        legal_moves = DIAGONAL_MOVES[:2]
+
+        with patch.object(small_gomoku_game, "display_state", wraps=small_gomoku_game.display_state) as display, \
+                patch.object(small_gomoku_game, "move_to_string", wraps=small_gomoku_game.move_to_string) as to_string:
+            first = agent._create_prompt(small_gomoku_game, empty_board_5x5, legal_moves, 0)
+            second = agent._create_prompt(small_gomoku_game, empty_board_5x5, legal_moves, 0)
+
+            assert first == second
+            assert display.call_count == 1
+            assert to_string.call_count == len(legal_moves)
+
+            # A changed board is rendered again
+            board = empty_board_5x5.copy()
+            board[2, 2] = 1
+            agent._create_prompt(small_gomoku_game, board, legal_moves, 0)
+            assert display.call_count == 2
+
+    @pytest.mark.parametrize("response, expected, fallback", [
+        # Valid response
+        ("After careful consideration, I believe the best move is 1.\nMOVE: 1", (1, 1), None),
+        # Response with different formatting
+        ("I will play move:1", (1, 1), None),
+        # Invalid response (fallback to random)
+        ("I'm not sure what to do.", (2, 2), (2, 2)),
+    ])
+    def test_parse_response(self, parsing_agent, small_gomoku_game, response, expected, fallback):
+        """Test parsing of different LLM responses."""
+        legal_moves = DIAGONAL_MOVES
+        
+        if fallback is None:
+            parsed_move = parsing_agent._parse_response(response, small_gomoku_game, legal_moves)
+        else:
+            with patch('random.choice', return_value=fallback):
+                parsed_move = parsing_agent._parse_response(response, small_gomoku_game, legal_moves)
+        
+        assert parsed_move == expected
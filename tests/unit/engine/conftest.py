@@ -0,0 +1,13 @@
+"""
+Pytest configuration for the engine tests.
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def _no_logger_io():
+    """Stop every engine test from writing match logs to disk."""
+    with patch('boardbench.utils.logger.Logger.log_match', return_value="mock.json") as mock_log_match:
+        yield mock_log_match
@@ -0,0 +1,78 @@
+"""
+Unit tests for the BatchMatchRunner engine.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from boardbench.engine.batch_runner import BatchMatchRunner
+from boardbench.engine.match_runner import MatchRunner
+from boardbench.games.gomoku import Gomoku
+from boardbench.agents.random_agent import RandomAgent
+from boardbench.utils.logger import Logger
+
+
+class BarrierAgent(RandomAgent):
+    """Random agent whose first move waits until every other match has started."""
+    
+    def __init__(self, name, barrier):
+        super().__init__(name)
+        self.barrier = barrier
+        self.waited = False
+    
+    def make_move(self, game, state, legal_moves, player):
+        if not self.waited:
+            self.waited = True
+            self.barrier.wait(timeout=5)
+        return super().make_move(game, state, legal_moves, player)
+
+
+def make_runner(agents):
+    """Create a runner on a small board with a mocked logger."""
+    return MatchRunner(Gomoku(board_size=5, win_length=3), agents, logger=MagicMock(spec=Logger))
+
+
+class TestBatchMatchRunner:
+    """Test running several matches concurrently."""
+    
+    def test_initialization_requires_runners(self):
+        """Test that an empty batch is rejected."""
+        with pytest.raises(ValueError):
+            BatchMatchRunner([])
+    
+    def test_invalid_max_concurrency(self):
+        """Test that a non-positive concurrency limit is rejected."""
+        runner = make_runner([RandomAgent("A"), RandomAgent("B")])
+        
+        with pytest.raises(ValueError):
+            BatchMatchRunner([runner], max_concurrency=0)
+    
+    def test_results_in_runner_order(self):
+        """Test that results are returned in the same order as the runners."""
+        runners = [
+            make_runner([RandomAgent(f"A{i}", seed=i), RandomAgent(f"B{i}", seed=i + 100)])
+            for i in range(4)
+        ]
+        
+        results = BatchMatchRunner(runners).run_matches(max_moves=25)
+        
+        assert len(results) == 4
+        for runner, result in zip(runners, results):
+            assert result["match_id"] == runner.match_id
+            runner.logger.log_match.assert_called_once()
+    
+    def test_matches_run_concurrently(self):
+        """Test that moves from different matches are in flight at the same time."""
+        num_matches = 3
+        barrier = threading.Barrier(num_matches)
+        runners = [
+            make_runner([BarrierAgent(f"Barrier{i}", barrier), RandomAgent(f"Random{i}")])
+            for i in range(num_matches)
+        ]
+        
+        BatchMatchRunner(runners).run_matches(max_moves=25)
+        
+        # The barrier only releases if all first moves were pending together
+        assert not barrier.broken
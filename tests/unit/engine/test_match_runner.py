@@ -7,10 +7,15 @@ import numpy as np
 from unittest.mock import MagicMock, patch
 import os
 import json
+import threading
 
 from boardbench.engine.match_runner import MatchRunner
+from boardbench.games.base import Game
 from boardbench.games.gomoku import Gomoku
+from boardbench.agents.base import Agent
 from boardbench.agents.random_agent import RandomAgent
+from boardbench.agents.llm_agent import LLMAgent
+from boardbench.utils.logger import Logger
 
 
 class TestMatchRunnerInit:
@@ -28,7 +33,7 @@ class TestMatchRunnerInit:
         assert runner.agents == agents
         assert runner.match_id is not None
         assert runner.moves_history == []
-        assert runner.states_history == []
+        assert runner.final_state is None
         assert runner.move_times == []
         assert runner.logger is not None
     
@@ -57,11 +62,11 @@ class TestMatchRunnerCore:
     def test_run_match_basic(self, gomoku_game):
         """Test a basic match run with mocked agents."""
         # Create mock agents that make predefined moves
-        agent1 = MagicMock()
+        agent1 = MagicMock(spec=Agent)
         agent1.name = "MockAgent1"
         agent1.make_move.return_value = (0, 0)  # Always returns top-left corner
         
-        agent2 = MagicMock()
+        agent2 = MagicMock(spec=Agent)
         agent2.name = "MockAgent2"
         agent2.make_move.return_value = (0, 1)  # Always returns position to the right
         
@@ -87,61 +92,38 @@ class TestMatchRunnerCore:
         assert agent1.game_end.called
         assert agent2.game_end.called
     
-    def test_agent_feedback_for_invalid_move(self):
+    def test_agent_feedback_for_invalid_move(self, stub_game):
         """Test that agents receive appropriate feedback for invalid moves."""
-        # Create mock game and agents
-        mock_game = MagicMock()
-        mock_game.name = "MockGame"
-        mock_game.num_players = 2
-        
-        # Configure mock game behavior
-        mock_state = np.zeros((3, 3), dtype=np.int8)  # Simple 3x3 empty board
-        mock_game.reset.return_value = mock_state
-        mock_game.is_terminal.return_value = False  # Game not over
-        mock_game.get_legal_moves.return_value = [(0, 0), (0, 1)]  # Legal moves
-        mock_game.move_to_string.return_value = "A1"  # Simple move representation
-        
-        # Critical for JSON serialization during logging
-        mock_game.get_winner.return_value = 0  # First player wins
-        mock_game.get_state_representation.return_value = {"board": [[0, 0, 0], [0, 0, 0], [0, 0, 0]]}  # JSON-serializable board
-        mock_game.display_state.return_value = "Mock Board Display"  # String representation
-        
-        # The make_move method will raise an error for an invalid move
-        def mock_make_move(state, move, player):
-            if move == (9, 9):  # This is our invalid move
-                raise ValueError("Invalid move")
-            return mock_state  # Return unchanged state for simplicity
-        
-        mock_game.make_move.side_effect = mock_make_move
+        # The stub game rejects (9, 9) as an invalid move
+        mock_game = stub_game
         
         # Create agents
-        agent1 = MagicMock()
+        agent1 = MagicMock(spec=Agent)
         agent1.name = "BadAgent"
         # Agent will make a bad move and then a good move when called again
         agent1.make_move.side_effect = [(9, 9), (0, 0)]
         
-        agent2 = MagicMock()
+        # Count feedback about invalid moves as it arrives
+        invalid_move_feedbacks = 0
+        
+        def count_feedback(game, state, move, success, message):
+            nonlocal invalid_move_feedbacks
+            invalid_move_feedbacks += success is False
+        
+        agent1.move_feedback.side_effect = count_feedback
+        
+        agent2 = MagicMock(spec=Agent)
         agent2.name = "GoodAgent"
         agent2.make_move.return_value = (0, 1)
         
         # Create runner with our mock objects
         runner = MatchRunner(mock_game, [agent1, agent2])
         
-        # Patch the logger to prevent actual file writing
-        with patch.object(runner.logger, 'log_match', return_value="mock_log_file.json"):
-            # Run a short match
-            result = runner.run_match(max_moves=3, verbose=False)
+        # Run a short match
+        result = runner.run_match(max_moves=3, verbose=False)
         
         # Verify the agent received feedback about the invalid move
-        # We expect at least one call with success=False (invalid move)
-        agent1.move_feedback.assert_called()
-        feedback_calls = agent1.move_feedback.call_args_list
-        
-        # Find calls where success is False (invalid move feedback)
-        invalid_move_feedbacks = [call for call in feedback_calls 
-                                  if call[0][3] is False]  # success parameter is False
-        
-        assert len(invalid_move_feedbacks) > 0, "Agent should have received feedback about invalid move"
+        assert invalid_move_feedbacks > 0, "Agent should have received feedback about invalid move"
         
         # Verify that the match was able to complete despite the invalid move
         assert result is not None
@@ -150,18 +132,85 @@ class TestMatchRunnerCore:
         # Verify feedback was given for the invalid move
         assert agent1.move_feedback.called
         
-        # Check that states_history contains the record of moves
-        assert len(runner.states_history) > 0
+        # Check that the final state was recorded
+        assert runner.final_state is not None
+    
+    def test_seeded_fallback_moves_are_reproducible(self, small_gomoku_game):
+        """Test that the random moves substituted for invalid ones follow the seed."""
+        def play(seed):
+            agents = []
+            for i in range(2):
+                agent = MagicMock(spec=Agent)
+                agent.name = f"InvalidAgent{i}"
+                agent.make_move.return_value = (99, 99)  # Never legal
+                agents.append(agent)
+            
+            runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger), seed=seed)
+            runner.run_match(max_moves=6, verbose=False)
+            return runner.final_state
+        
+        first = play(seed=5)
+        
+        assert np.count_nonzero(first) == 6
+        assert np.array_equal(first, play(seed=5))
+    
+    def test_turn_order_with_more_than_two_players(self):
+        """Test that turns rotate through every player in games with more than two."""
+        mock_game = MagicMock(spec=Game)
+        mock_game.name = "MockGame"
+        mock_game.num_players = 3
+        mock_game.reset.return_value = np.zeros((3, 3), dtype=np.int8)
+        mock_game.is_terminal.return_value = False
+        mock_game.get_legal_moves.return_value = [(0, 0)]
+        mock_game.make_move.side_effect = lambda state, move, player: state
+        mock_game.get_winner.return_value = None
+        
+        agents = []
+        for i in range(3):
+            agent = MagicMock(spec=Agent)
+            agent.name = f"Agent{i}"
+            agent.make_move.return_value = (0, 0)
+            agents.append(agent)
+        
+        runner = MatchRunner(mock_game, agents, logger=MagicMock(spec=Logger))
+        runner.run_match(max_moves=7, verbose=False)
+        
+        players = [call[0][2] for call in mock_game.make_move.call_args_list]
+        assert players == [0, 1, 2, 0, 1, 2, 0]
+        # The first check has no move to go on, later ones get the last move
+        assert mock_game.is_terminal.call_args_list[0][0][1] is None
+        assert mock_game.is_terminal.call_args_list[-1][0][1] == (0, 0)
+    
+    def test_game_without_last_move_parameter(self, stub_game):
+        """Test that games implementing the old is_terminal(state) still run."""
+        states_checked = []
+        
+        def is_terminal(state):
+            states_checked.append(state)
+            return len(states_checked) > 2
+        
+        stub_game.is_terminal = is_terminal
+        agents = []
+        for i in range(2):
+            agent = MagicMock(spec=Agent)
+            agent.name = f"Agent{i}"
+            agent.make_move.return_value = (0, 0)
+            agents.append(agent)
+        
+        result = MatchRunner(stub_game, agents, logger=MagicMock(spec=Logger)).run_match(max_moves=5, verbose=False)
+        
+        assert result["moves"] == 2
+        assert len(states_checked) == 3
     
     def test_run_match_to_win(self, small_gomoku_game):
         """Test running a match to a win condition."""
         # Create mock agents where one will win quickly
-        agent1 = MagicMock()
+        agent1 = MagicMock(spec=Agent)
         agent1.name = "WinningAgent"
         # Make moves that will create 3 in a row for win_length=3
         agent1.make_move.side_effect = [(0, 0), (0, 1), (0, 2)]
         
-        agent2 = MagicMock()
+        agent2 = MagicMock(spec=Agent)
         agent2.name = "LosingAgent"
         agent2.make_move.side_effect = [(1, 0), (1, 1)]
         
@@ -174,13 +223,115 @@ class TestMatchRunnerCore:
         assert result["moves"] == 5  # 5 moves in total (3 by agent1, 2 by agent2)
 
 
+class TestMatchRunnerNotifications:
+    """Test how agents are notified of game start and end."""
+    
+    def test_blocking_agents_notified_concurrently(self, small_gomoku_game):
+        """Test that game start hooks of agents with blocking hooks run on a thread pool."""
+        barrier = threading.Barrier(2)
+        agents = []
+        for i in range(2):
+            agent = MagicMock(spec=Agent)
+            agent.name = f"Remote{i}"
+            agent.blocking_hooks = True
+            agent.make_move.return_value = (i, i)
+            # Both hooks must be running at the same time to pass the barrier
+            agent.game_start.side_effect = lambda game, player: barrier.wait(timeout=5)
+            agents.append(agent)
+        
+        runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger))
+        runner.run_match(max_moves=2, verbose=False)
+        
+        assert not barrier.broken
+        for i, agent in enumerate(agents):
+            agent.game_start.assert_called_once_with(small_gomoku_game, i)
+            agent.game_end.assert_called_once()
+    
+    def test_local_agents_notified_in_order(self, small_gomoku_game):
+        """Test that agents without blocking hooks, LLM agents included, are notified on the calling thread."""
+        assert not LLMAgent.blocking_hooks  # Its hooks are the base class no-ops
+        
+        calls = []
+        agents = [RandomAgent("Random1"), RandomAgent("Random2")]
+        for agent in agents:
+            agent.game_start = lambda game, player: calls.append((player, threading.get_ident()))
+        
+        runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger))
+        runner.run_match(max_moves=2, verbose=False)
+        
+        assert calls == [(0, threading.get_ident()), (1, threading.get_ident())]
+
+
+class TestMatchRunnerRandomPlayout:
+    """Test the compiled fast path for matches between random agents."""
+    
+    def test_random_agents_use_playout(self, small_gomoku_game):
+        """Test that random-vs-random matches are played by the game's playout when requested."""
+        agents = [RandomAgent("Random1", seed=1), RandomAgent("Random2", seed=2)]
+        runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger), compiled_random=True)
+        
+        with patch.object(small_gomoku_game, "random_playout",
+                          wraps=small_gomoku_game.random_playout) as playout:
+            result = runner.run_match(max_moves=25, verbose=True)
+        
+        playout.assert_called_once()
+        assert result["moves"] == len(runner.moves_history) == np.count_nonzero(runner.final_state)
+        assert result["winner"] == small_gomoku_game.get_winner(runner.final_state)
+        assert [entry["player"] for entry in runner.moves_history[:2]] == [0, 1]
+    
+    def test_playout_is_opt_in(self, small_gomoku_game):
+        """Test that random agents are asked for every move unless the playout is requested."""
+        agents = [RandomAgent("Random1", seed=1), RandomAgent("Random2", seed=2)]
+        runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger))
+        
+        with patch.object(small_gomoku_game, "random_playout") as playout, \
+                patch.object(RandomAgent, "make_move", autospec=True,
+                             side_effect=RandomAgent.make_move) as make_move:
+            result = runner.run_match(max_moves=25, verbose=False)
+        
+        playout.assert_not_called()
+        assert make_move.call_count == result["moves"] > 0
+    
+    def test_unsupported_game_falls_back_to_loop(self, small_gomoku_game):
+        """Test that games without a playout are run move by move, without drawing seeds."""
+        class NoPlayoutGomoku(type(small_gomoku_game)):
+            random_playout = Game.random_playout
+        
+        game = NoPlayoutGomoku(board_size=5, win_length=3)
+        agents = [RandomAgent("Random1", seed=1), RandomAgent("Random2", seed=2)]
+        runner = MatchRunner(game, agents, logger=MagicMock(spec=Logger), compiled_random=True)
+        
+        with patch.object(RandomAgent, "draw_seed") as draw_seed:
+            result = runner.run_match(max_moves=25, verbose=False)
+        
+        draw_seed.assert_not_called()
+        assert result["moves"] > 0
+        assert game.is_terminal(runner.final_state) or result["moves"] == 25
+    
+    def test_other_agents_use_loop(self, small_gomoku_game):
+        """Test that the playout is skipped unless every agent plays uniformly random moves."""
+        class FirstMoveAgent(RandomAgent):
+            plays_uniform_random = False
+            
+            def make_move(self, game, state, legal_moves, player):
+                return legal_moves[0]
+        
+        agents = [RandomAgent("Random"), FirstMoveAgent("First")]
+        runner = MatchRunner(small_gomoku_game, agents, logger=MagicMock(spec=Logger), compiled_random=True)
+        
+        with patch.object(small_gomoku_game, "random_playout") as playout:
+            runner.run_match(max_moves=25, verbose=False)
+        
+        playout.assert_not_called()
+
+
 class TestMatchRunnerLogging:
     """Test the logging functionality of MatchRunner."""
     
     def test_log_match(self, gomoku_game, random_agent):
         """Test that match results are logged correctly."""
         agents = [random_agent, RandomAgent("Agent2")]
-        logger_mock = MagicMock()
+        logger_mock = MagicMock(spec=Logger)
         
         runner = MatchRunner(gomoku_game, agents, logger=logger_mock)
         
@@ -195,8 +346,8 @@ class TestMatchRunnerLogging:
             "max_move_time": 0.02
         }
         
-        # Initialize states_history with a dummy state to prevent IndexError
-        runner.states_history = [np.zeros((15, 15), dtype=np.int8)]
+        # Initialize the final state with a dummy board
+        runner.final_state = np.zeros((15, 15), dtype=np.int8)
         
         # Log the match
         runner.log_match(result)
@@ -211,3 +362,38 @@ class TestMatchRunnerLogging:
         assert log_data["agents"] == result["agents"]
         assert "moves_history" in log_data
         assert "final_state" in log_data
+    
+    def test_closes_only_its_own_logger(self, small_gomoku_game):
+        """Test that the runner closes the logger it created, but not one it was given."""
+        agents = [RandomAgent("Agent1", seed=1), RandomAgent("Agent2", seed=2)]
+        logger_mock = MagicMock(spec=Logger)
+        
+        MatchRunner(small_gomoku_game, agents, logger=logger_mock).run_match(max_moves=5, verbose=False)
+        with patch('boardbench.engine.match_runner.Logger') as logger_class:
+            MatchRunner(small_gomoku_game, agents).run_match(max_moves=5, verbose=False)
+        
+        logger_mock.close.assert_not_called()
+        logger_class.return_value.close.assert_called_once()
+    
+    def test_stream_moves(self, small_gomoku_game):
+        """Test that streamed moves go to the logger instead of the in-memory history."""
+        agent1 = MagicMock(spec=Agent)
+        agent1.name = "StreamingAgent1"
+        agent1.make_move.side_effect = [(0, 0), (0, 1), (0, 2)]
+        
+        agent2 = MagicMock(spec=Agent)
+        agent2.name = "StreamingAgent2"
+        agent2.make_move.side_effect = [(1, 0), (1, 1)]
+        
+        logger_mock = MagicMock(spec=Logger)
+        runner = MatchRunner(small_gomoku_game, [agent1, agent2], logger=logger_mock, stream_moves=True)
+        
+        result = runner.run_match(max_moves=10, verbose=False)
+        
+        assert result["moves"] == 5
+        assert runner.moves_history == []
+        assert logger_mock.log_move.call_count == 5
+        match_id, first_move = logger_mock.log_move.call_args_list[0][0]
+        assert match_id == runner.match_id
+        assert first_move["move"] == "0,0"
+        assert "moves_history" not in logger_mock.log_match.call_args[0][0]
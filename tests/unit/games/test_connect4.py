@@ -0,0 +1,182 @@
+"""
+Unit tests for the Connect4 game implementation.
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import patch
+from boardbench.games.connect4 import Connect4
+from boardbench.games.kernels import wins_at
+
+
+@pytest.fixture
+def connect4_game():
+    """Return a standard 6x7 Connect4 game instance."""
+    return Connect4()
+
+
+class TestConnect4Basics:
+    """Test basic properties and methods of the Connect4 game."""
+    
+    def test_reset(self, connect4_game):
+        """Test that reset returns an empty board of the correct size."""
+        state = connect4_game.reset()
+        
+        assert state.shape == (6, 7)
+        assert np.all(state == 0)
+        assert state.dtype == np.int8 and state.flags.c_contiguous
+        assert connect4_game.make_move(state, 3, 1).dtype == np.int8
+        
+        # Each reset hands out a fresh board
+        state[5, 0] = 1
+        assert not connect4_game.reset().any()
+    
+    def test_make_move_stacks_pieces(self, connect4_game):
+        """Test that pieces drop to the lowest empty row of a column."""
+        state = connect4_game.reset()
+        state = connect4_game.make_move(state, 3, 0)
+        state = connect4_game.make_move(state, 3, 1)
+        
+        assert state[5, 3] == 1
+        assert state[4, 3] == 2
+        assert np.count_nonzero(state) == 2
+    
+    def test_get_legal_moves_excludes_full_columns(self, connect4_game):
+        """Test that full columns are not legal moves."""
+        state = connect4_game.reset()
+        for i in range(6):
+            state = connect4_game.make_move(state, 0, i % 2)
+        
+        assert connect4_game.get_legal_moves(state, 0) == [1, 2, 3, 4, 5, 6]
+    
+    def test_make_move_inplace_flag(self, connect4_game):
+        """Test that inplace=True drops the piece into the given board."""
+        state = connect4_game.reset()
+        
+        new_state = connect4_game.make_move(state, 2, 0, inplace=True)
+        
+        assert new_state is state
+        assert state[5, 2] == 1
+    
+    def test_make_move_full_column(self, connect4_game):
+        """Test that dropping a piece into a full column is rejected."""
+        state = connect4_game.reset()
+        state[:, 2] = 1
+        
+        with pytest.raises(ValueError) as excinfo:
+            connect4_game.make_move(state, 2, 1)
+        
+        assert "full" in str(excinfo.value)
+    
+    def test_make_move_inplace_and_undo(self, connect4_game):
+        """Test that in-place moves stack like make_move and undo restores the board."""
+        state = connect4_game.reset()
+        expected = connect4_game.make_move(connect4_game.make_move(state, 4, 0), 4, 1)
+        
+        connect4_game.make_move_inplace(state, 4, 0)
+        connect4_game.make_move_inplace(state, 4, 1)
+        assert np.array_equal(state, expected)
+        
+        connect4_game.undo_move(state, 4)
+        assert state[4, 4] == 0 and state[5, 4] == 1
+        connect4_game.undo_move(state, 4)
+        assert not state.any()
+        
+        with pytest.raises(ValueError) as excinfo:
+            connect4_game.undo_move(state, 4)
+        
+        assert "empty" in str(excinfo.value)
+        
+        state[:, 4] = 1
+        with pytest.raises(ValueError) as excinfo:
+            connect4_game.make_move_inplace(state, 4, 0)
+        
+        assert "full" in str(excinfo.value)
+
+
+class TestConnect4Winner:
+    """Test win detection in Connect4."""
+    
+    @pytest.mark.parametrize("cells", [
+        [(5, 0), (5, 1), (5, 2), (5, 3)],  # Horizontal
+        [(5, 6), (4, 6), (3, 6), (2, 6)],  # Vertical
+        [(5, 0), (4, 1), (3, 2), (2, 3)],  # Rising diagonal
+        [(2, 3), (3, 4), (4, 5), (5, 6)],  # Falling diagonal
+        [(0, 3), (0, 4), (0, 5), (0, 6)],  # Top row
+    ])
+    def test_detects_lines(self, connect4_game, cells):
+        """Test that lines are detected in every direction and for both players."""
+        for player in range(2):
+            state = connect4_game.reset()
+            for row, col in cells:
+                state[row, col] = player + 1
+            
+            assert connect4_game.get_winner(state) == player
+            assert connect4_game.is_terminal(state)
+    
+    def test_lines_do_not_wrap_between_columns(self, connect4_game):
+        """Test that runs split across the top and bottom of adjacent columns are not wins."""
+        state = connect4_game.reset()
+        state[0:2, 0] = 1  # Top of column 0
+        state[4:6, 1] = 1  # Bottom of column 1
+        
+        assert connect4_game.get_winner(state) is None
+    
+    def test_three_in_a_row_is_not_a_win(self, connect4_game):
+        """Test that lines shorter than win_length are not wins."""
+        state = connect4_game.reset()
+        state[5, 0:3] = 1
+        state[3:6, 6] = 2
+        
+        assert connect4_game.get_winner(state) is None
+        assert not connect4_game.is_terminal(state)
+    
+    def test_full_board_is_terminal(self, connect4_game):
+        """Test that a full board without a line ends the game."""
+        state = np.array([
+            [2, 2, 1, 2, 1, 1, 1],
+            [1, 2, 1, 2, 2, 2, 1],
+            [1, 1, 2, 2, 1, 1, 2],
+            [2, 1, 1, 1, 2, 2, 1],
+            [2, 1, 2, 2, 2, 1, 2],
+            [1, 2, 1, 1, 1, 2, 2],
+        ], dtype=np.int8)
+        
+        assert connect4_game.get_winner(state) is None
+        assert connect4_game.is_terminal(state)
+        assert not connect4_game.is_terminal(connect4_game.reset())
+    
+    def test_win_detection_after_last_move(self, connect4_game):
+        """Test that the incremental check finds wins through the top piece of the played column."""
+        state = connect4_game.reset()
+        for col in range(3):
+            state = connect4_game.make_move(state, col, 0)
+            state = connect4_game.make_move(state, col, 1)
+        
+        state = connect4_game.make_move(state, 3, 1)
+        
+        assert not connect4_game.is_terminal(state, last_move=3)
+        
+        state = connect4_game.make_move(state, 3, 1)  # Player 1 completes the second row
+        
+        assert connect4_game.get_winner_after(state, 4, 3) == 1
+        assert connect4_game.is_terminal(state, last_move=3)
+    
+    @pytest.mark.parametrize("compiled", [True, False])
+    @pytest.mark.parametrize("rows,cols,win_length", [(6, 7, 4), (9, 9, 5), (4, 5, 3)])
+    def test_matches_cell_by_cell_check(self, rows, cols, win_length, compiled):
+        """Test the compiled scan and the bitboard check against walking the lines through every cell."""
+        game = Connect4(rows=rows, cols=cols, win_length=win_length)
+        rng = np.random.default_rng(0)
+        
+        with patch("boardbench.games.connect4.NUMBA_AVAILABLE", compiled):
+            for _ in range(200):
+                state = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(rows, cols))
+                expected = None
+                for player_id in (1, 2):
+                    if any(wins_at(state, row, col, win_length)
+                           for row, col in zip(*np.nonzero(state == player_id))):
+                        expected = player_id - 1
+                        break
+                
+                assert game.get_winner(state) == expected
@@ -4,7 +4,9 @@ Unit tests for the Gomoku game implementation.
 
 import pytest
 import numpy as np
+from unittest.mock import patch
 from boardbench.games.gomoku import Gomoku
+from boardbench.games.kernels import wins_at
 
 
 class TestGomokuBasics:
@@ -29,6 +31,13 @@ class TestGomokuBasics:
         assert isinstance(state, np.ndarray)
         assert state.shape == (15, 15)
         assert np.all(state == 0)  # All positions should be empty (0)
+        # The compiled kernels are specialized for contiguous int8 boards
+        assert state.dtype == np.int8 and state.flags.c_contiguous
+        assert game.make_move(state, (7, 7), 1).dtype == np.int8
+        
+        # Each reset hands out a fresh board
+        state[0, 0] = 1
+        assert not game.reset().any()
     
     def test_get_legal_moves(self, small_gomoku_game, empty_board_5x5):
         """Test that legal moves are correctly identified."""
@@ -42,6 +51,21 @@ class TestGomokuBasics:
         legal_moves = small_gomoku_game.get_legal_moves(board, 0)
         assert len(legal_moves) == 24  # One less legal move
         assert (2, 2) not in legal_moves  # Center position is not legal
+        assert small_gomoku_game.count_legal_moves(board, 0) == 24
+        assert legal_moves == sorted(legal_moves)  # Row-major order
+        assert all(isinstance(coord, int) for move in legal_moves for coord in move)
+    
+    def test_legal_mask(self, small_gomoku_game, empty_board_5x5):
+        """Test that the legality mask agrees with the list of legal moves."""
+        board = empty_board_5x5.copy()
+        board[2, 2] = 1
+        board[0, 4] = 2
+        
+        mask = small_gomoku_game.legal_mask(board, 0)
+        
+        assert mask.shape == (5, 5)
+        assert mask.dtype == bool
+        assert sorted(zip(*np.nonzero(mask))) == sorted(small_gomoku_game.get_legal_moves(board, 0))
     
     def test_make_move(self, small_gomoku_game, empty_board_5x5):
         """Test that making a move updates the board correctly."""
@@ -60,6 +84,34 @@ class TestGomokuBasics:
         assert new_state2[1, 1] == 2  # Player 1's stone is marked as 2
         assert new_state2[2, 3] == 1  # First move is still there
     
+    def test_make_move_inplace_flag(self, small_gomoku_game, empty_board_5x5):
+        """Test that inplace=True places the stone on the given board after validating it."""
+        board = empty_board_5x5.copy()
+        
+        new_board = small_gomoku_game.make_move(board, (0, 4), 0, inplace=True)
+        
+        assert new_board is board
+        assert board[0, 4] == 1
+        with pytest.raises(ValueError):
+            small_gomoku_game.make_move(board, (0, 4), 1, inplace=True)
+        assert board[0, 4] == 1
+    
+    def test_make_move_inplace_and_undo(self, small_gomoku_game, empty_board_5x5):
+        """Test that in-place moves modify the given board and undo restores it."""
+        board = empty_board_5x5.copy()
+        
+        small_gomoku_game.make_move_inplace(board, (1, 3), 1)
+        assert board[1, 3] == 2
+        assert np.count_nonzero(board) == 1
+        
+        small_gomoku_game.undo_move(board, (1, 3))
+        assert np.array_equal(board, empty_board_5x5)
+        
+        small_gomoku_game.make_move_inplace(board, (1, 3), 0)
+        with pytest.raises(ValueError):
+            small_gomoku_game.make_move_inplace(board, (1, 3), 1)
+        assert board[1, 3] == 1
+    
     def test_invalid_moves(self, small_gomoku_game, empty_board_5x5):
         """Test that invalid moves raise appropriate exceptions."""
         # Place a stone
@@ -119,6 +171,38 @@ class TestGomokuGameplay:
         
         assert not small_gomoku_game.is_terminal(board)
         assert small_gomoku_game.get_winner(board) is None
+    
+    def test_win_detection_after_last_move(self, small_gomoku_game, horizontal_win_board_5x5):
+        """Test that the incremental check only looks at lines through the last move."""
+        # (2, 1) is part of player 0's row, (0, 0) is empty
+        assert small_gomoku_game.get_winner_after(horizontal_win_board_5x5, 2, 1) == 0
+        assert small_gomoku_game.get_winner_after(horizontal_win_board_5x5, 0, 0) is None
+        assert small_gomoku_game.is_terminal(horizontal_win_board_5x5, last_move=(2, 1))
+        
+        # A stone away from the line cannot have created the win
+        board = horizontal_win_board_5x5.copy()
+        board[4, 4] = 2
+        assert not small_gomoku_game.is_terminal(board, last_move=(4, 4))
+    
+    @pytest.mark.parametrize("compiled", [True, False])
+    @pytest.mark.parametrize("board_size,win_length", [(15, 5), (8, 5), (5, 3)])
+    def test_matches_cell_by_cell_check(self, board_size, win_length, compiled):
+        """Test the compiled scan and the bitboard check against walking the lines through every cell."""
+        game = Gomoku(board_size=board_size, win_length=win_length)
+        rng = np.random.default_rng(0)
+        
+        with patch("boardbench.games.gomoku.NUMBA_AVAILABLE", compiled):
+            for _ in range(200):
+                state = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(board_size, board_size),
+                                   p=[0.5, 0.25, 0.25])
+                expected = None
+                for player_id in (1, 2):
+                    if any(wins_at(state, row, col, win_length)
+                           for row, col in zip(*np.nonzero(state == player_id))):
+                        expected = player_id - 1
+                        break
+                
+                assert game.get_winner(state) == expected
 
 
 class TestGomokuRepresentation:
@@ -161,3 +245,42 @@ class TestGomokuRepresentation:
         # Test invalid string format
         with pytest.raises(ValueError):
             small_gomoku_game.string_to_move("invalid")
+        
+        # Off-board moves still convert, so invalid moves can be reported
+        assert small_gomoku_game.move_to_string((9, 9)) == "9,9"
+        assert small_gomoku_game.string_to_move("9,9") == (9, 9)
+        assert small_gomoku_game.move_to_string((np.int64(2), np.int64(3))) == "2,3"
+    
+    def test_state_key(self, small_gomoku_game, empty_board_5x5):
+        """Test that equal states share a key and different states don't."""
+        board = empty_board_5x5.copy()
+        key = small_gomoku_game.state_key(board)
+        
+        assert key == small_gomoku_game.state_key(empty_board_5x5.copy())
+        board[1, 1] = 1
+        assert key != small_gomoku_game.state_key(board)
+        assert isinstance(key, bytes)
+    
+    def test_winner_is_cached(self, horizontal_win_board_5x5):
+        """Test that revisited positions are answered from the cache."""
+        # A fresh game, since the shared fixture's cache is filled by other tests
+        small_gomoku_game = Gomoku(board_size=5, win_length=3)
+        with patch.object(small_gomoku_game, "_find_winner",
+                          wraps=small_gomoku_game._find_winner) as find_winner:
+            assert small_gomoku_game.get_winner(horizontal_win_board_5x5) == 0
+            assert small_gomoku_game.get_winner(horizontal_win_board_5x5.copy()) == 0
+        
+        find_winner.assert_called_once()
+    
+    def test_winner_cache_is_bounded(self, empty_board_5x5):
+        """Test that the least recently used positions are evicted."""
+        small_gomoku_game = Gomoku(board_size=5, win_length=3)
+        with patch("boardbench.games.gomoku.WINNER_CACHE_SIZE", 2):
+            boards = []
+            for i in range(3):
+                board = empty_board_5x5.copy()
+                board[0, i] = 1
+                boards.append(board)
+                small_gomoku_game.get_winner(board)
+        
+        assert list(small_gomoku_game._winner_cache) == [small_gomoku_game.state_key(b) for b in boards[1:]]
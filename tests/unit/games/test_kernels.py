@@ -0,0 +1,166 @@
+"""
+Unit tests for the compiled grid-game kernels.
+"""
+
+import pytest
+import numpy as np
+
+from boardbench.games.kernels import (wins_at, scan_winner, random_playout, batch_winners,
+                                      pack_bitboards, bitboard_winner)
+from boardbench.games.gomoku import Gomoku
+from boardbench.games.connect4 import Connect4
+
+
+class TestWinsAt:
+    """Test the last-move win check."""
+    
+    def test_detects_lines_through_cell(self, horizontal_win_board_5x5, vertical_win_board_5x5,
+                                        diagonal_win_board_5x5):
+        """Test that a line through the given cell is found in every direction."""
+        assert wins_at(horizontal_win_board_5x5, 2, 1, 3)
+        assert wins_at(vertical_win_board_5x5, 0, 2, 3)
+        assert wins_at(diagonal_win_board_5x5, 2, 2, 3)
+    
+    def test_anti_diagonal(self, empty_board_5x5):
+        """Test detection along the down-left diagonal."""
+        board = empty_board_5x5.copy()
+        for i in range(3):
+            board[i, 4 - i] = 2
+        
+        assert wins_at(board, 1, 3, 3)
+    
+    def test_no_line(self, horizontal_win_board_5x5):
+        """Test that cells not on a long enough line are not reported."""
+        assert not wins_at(horizontal_win_board_5x5, 2, 1, 4)
+        assert not wins_at(horizontal_win_board_5x5, 0, 0, 3)  # Empty cell
+
+
+class TestScanWinner:
+    """Test the full-board win scan."""
+    
+    def test_finds_lines(self, horizontal_win_board_5x5, vertical_win_board_5x5,
+                         diagonal_win_board_5x5, empty_board_5x5):
+        """Test that lines are found in each direction and empty boards have no winner."""
+        assert scan_winner(horizontal_win_board_5x5, 3) == 0
+        assert scan_winner(vertical_win_board_5x5, 3) == 1
+        assert scan_winner(diagonal_win_board_5x5, 3) == 0
+        assert scan_winner(empty_board_5x5, 3) == -1
+    
+    @pytest.mark.parametrize("rows,cols", [(7, 9), (5, 64), (4, 65)])  # Row masks fit up to 64 columns
+    def test_matches_cell_by_cell_check(self, rows, cols):
+        """Test the scan against walking the lines through every cell."""
+        rng = np.random.default_rng(0)
+        
+        for _ in range(200):
+            board = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(rows, cols), p=[0.5, 0.25, 0.25])
+            expected = -1
+            for player_id in (1, 2):
+                if any(wins_at(board, row, col, 4) for row, col in zip(*np.nonzero(board == player_id))):
+                    expected = player_id - 1
+                    break
+            
+            assert scan_winner(board, 4) == expected
+
+
+class TestBitboards:
+    """Test the bitboard win check."""
+    
+    def test_pack_bitboards(self):
+        """Test that each row is packed with a clear bit after its last cell."""
+        board = np.array([[1, 0, 2],
+                          [0, 2, 1]], dtype=np.int8)
+        
+        player0, player1 = pack_bitboards(board)
+        
+        assert player0 == (1 << 0) | (1 << 6)
+        assert player1 == (1 << 2) | (1 << 5)
+    
+    def test_lines_do_not_wrap_between_rows(self):
+        """Test that a run split across the end of one row and the start of the next is not a win."""
+        board = np.zeros((4, 4), dtype=np.int8)
+        board[0, 2:] = 1
+        board[1, :2] = 1
+        
+        assert bitboard_winner(board, 4) == -1
+    
+    def test_matches_scan(self):
+        """Test that the bitboard check finds the same winner as the scan."""
+        rng = np.random.default_rng(2)
+        
+        for _ in range(200):
+            board = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(7, 9), p=[0.4, 0.3, 0.3])
+            
+            assert bitboard_winner(board, 4) == scan_winner(board, 4)
+
+
+class TestBatchWinners:
+    """Test the vectorized batch win check."""
+    
+    @pytest.mark.parametrize("game", [Gomoku(board_size=7, win_length=4), Connect4()])
+    def test_matches_single_board_check(self, game):
+        """Test that every board in a batch gets the same winner as get_winner."""
+        rng = np.random.default_rng(1)
+        states = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(300,) + game.reset().shape,
+                            p=[0.5, 0.25, 0.25])
+        
+        winners = game.get_winner_batch(states)
+        
+        expected = [game.get_winner(state) for state in states]
+        assert winners.dtype == np.int8
+        assert winners.tolist() == [-1 if winner is None else winner for winner in expected]
+    
+    def test_keeps_leading_axes(self, horizontal_win_board_5x5, vertical_win_board_5x5,
+                                empty_board_5x5):
+        """Test that boards may be stacked along several leading axes."""
+        states = np.array([[horizontal_win_board_5x5, vertical_win_board_5x5],
+                           [empty_board_5x5, horizontal_win_board_5x5]])
+        
+        assert batch_winners(states, 3).tolist() == [[0, 1], [-1, 0]]
+        assert batch_winners(empty_board_5x5, 6) == -1  # Longer than the board
+
+
+class TestRandomPlayout:
+    """Test the random playout kernel."""
+    
+    def test_gomoku_playout_matches_rules(self):
+        """Test that a Gomoku playout ends in a state the game agrees with."""
+        game = Gomoku(board_size=5, win_length=3)
+        
+        state, moves, winner = game.random_playout(game.reset(), 25, seed=7)
+        
+        assert len(moves) == np.count_nonzero(state)
+        assert len(set(moves)) == len(moves)
+        assert game.is_terminal(state)
+        assert game.get_winner(state) == winner
+    
+    def test_connect4_playout_respects_gravity(self):
+        """Test that Connect4 playouts stack pieces from the bottom."""
+        game = Connect4()
+        
+        state, moves, winner = game.random_playout(game.reset(), 42, seed=3)
+        
+        assert all(isinstance(move, int) for move in moves)
+        heights = np.count_nonzero(state, axis=0)
+        for col in range(7):
+            # Occupied cells in each column are contiguous from the bottom row
+            assert np.all(state[6 - heights[col]:, col] != 0)
+        assert game.get_winner(state) == winner
+    
+    def test_playout_is_reproducible(self):
+        """Test that the same seed replays the same moves."""
+        board = np.zeros((5, 5), dtype=np.int8)
+        
+        first = random_playout(board.copy(), 3, False, 25, 11)
+        second = random_playout(board.copy(), 3, False, 25, 11)
+        
+        assert first[1] == second[1]
+        assert np.array_equal(first[0][:first[1]], second[0][:second[1]])
+    
+    def test_playout_stops_at_max_moves(self):
+        """Test that no more than max_moves are played."""
+        game = Gomoku(board_size=15, win_length=5)
+        
+        state, moves, winner = game.random_playout(game.reset(), 4, seed=1)
+        
+        assert len(moves) == 4
+        assert winner is None
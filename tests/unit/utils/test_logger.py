@@ -10,7 +10,7 @@ import numpy as np
 from datetime import datetime
 from unittest.mock import patch, mock_open
 
-from boardbench.utils.logger import Logger
+from boardbench.utils.logger import Logger, ZSTD_AVAILABLE
 
 
 class TestLogger:
@@ -37,6 +37,24 @@ class TestLogger:
         assert os.path.exists(temp_log_dir)
         assert logger.log_dir == temp_log_dir
     
+    def test_new_logger_recreates_removed_directory(self, temp_log_dir):
+        """Test that a new logger creates its directory again if an earlier logger's was removed."""
+        Logger(temp_log_dir)
+        shutil.rmtree(temp_log_dir)
+        
+        log_path = Logger(temp_log_dir).log_match({"match_id": "test-recreate-123", "game": "Gomoku"})
+        
+        assert os.path.exists(log_path)
+    
+    def test_relative_log_dir_follows_working_directory(self, temp_log_dir, monkeypatch):
+        """Test that a relative log directory is created under each working directory it is used from."""
+        for name in ("first", "second"):
+            os.makedirs(os.path.join(temp_log_dir, name))
+            monkeypatch.chdir(os.path.join(temp_log_dir, name))
+            Logger("logs")
+            
+            assert os.path.isdir(os.path.join(temp_log_dir, name, "logs"))
+    
     def test_log_match(self, temp_log_dir):
         """Test logging match data to a file."""
         logger = Logger(temp_log_dir)
@@ -69,6 +87,47 @@ class TestLogger:
             assert loaded_data["moves"] == match_data["moves"]
             assert loaded_data["winner"] == match_data["winner"]
     
+    def test_log_match_leaves_no_temporary_files(self, temp_log_dir):
+        """Test that logs are moved into place and only the final file remains."""
+        logger = Logger(temp_log_dir)
+        
+        log_path = logger.log_match({"match_id": "test-atomic-123", "game": "Gomoku"})
+        
+        assert os.listdir(temp_log_dir) == [os.path.basename(log_path)]
+    
+    def test_failed_write_removes_temporary_file(self, temp_log_dir):
+        """Test that a log that could not be moved into place leaves nothing behind."""
+        logger = Logger(temp_log_dir)
+        
+        with patch("boardbench.utils.logger.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                logger.log_match({"match_id": "test-failed-123", "game": "Gomoku"})
+        
+        assert os.listdir(temp_log_dir) == []
+    
+    def test_pretty_output(self, temp_log_dir):
+        """Test that logs are compact by default and indented when pretty is set."""
+        match_data = {"match_id": "test-pretty-123", "agents": ["Agent1", "Agent2"]}
+        
+        with open(Logger(temp_log_dir).log_match(match_data), 'r') as f:
+            compact = f.read()
+        with open(Logger(temp_log_dir, pretty=True).log_match(match_data), 'r') as f:
+            pretty = f.read()
+        
+        assert "\n" not in compact.strip()
+        assert pretty.startswith('{\n  "match_id"')
+        assert json.loads(compact) == json.loads(pretty) == match_data
+    
+    def test_log_filenames_sort_chronologically(self, temp_log_dir):
+        """Test that log files are prefixed with a timestamp that orders them."""
+        logger = Logger(temp_log_dir)
+        
+        paths = [logger.log_match({"match_id": f"test-order-{i}", "game": "Gomoku"}) for i in range(3)]
+        
+        names = [os.path.basename(path) for path in paths]
+        assert all(name.split("_")[0].isdigit() for name in names)
+        assert sorted(names, key=lambda name: int(name.split("_")[0])) == names
+    
     def test_log_match_with_numpy_arrays(self, temp_log_dir):
         """Test logging match data that includes numpy arrays."""
         logger = Logger(temp_log_dir)
@@ -103,6 +162,86 @@ class TestLogger:
             assert loaded_data["final_state"][1][1] == 2
             assert isinstance(loaded_data["moves_history"][0]["board"], list)
     
+    def test_log_match_with_numpy_scalars_and_views(self, temp_log_dir):
+        """Test logging values the encoder does not handle natively."""
+        logger = Logger(temp_log_dir)
+        board = np.arange(16, dtype=np.int8).reshape(4, 4)
+        
+        match_data = {
+            "match_id": "test-types-123",
+            "winner": np.int64(1),
+            "avg_move_time": np.float32(0.5),
+            "column": board[:, 1],  # Non-contiguous view
+            "agents": {"Agent1"},
+        }
+        
+        log_path = logger.log_match(match_data)
+        
+        with open(log_path, 'r') as f:
+            loaded_data = json.load(f)
+        
+        assert loaded_data["winner"] == 1
+        assert loaded_data["avg_move_time"] == 0.5
+        assert loaded_data["column"] == [1, 5, 9, 13]
+        assert loaded_data["agents"] == ["Agent1"]
+    
+    def test_log_match_with_non_str_keys(self, temp_log_dir):
+        """Test that non-string dict keys are written as strings, as json.dump does."""
+        logger = Logger(temp_log_dir)
+        
+        logger.log_move("test-keys-123", {"counts": {2: 3}})
+        log_path = logger.log_match({"match_id": "test-keys-123", "scores": {0: 1, 1: 0}})
+        
+        loaded_data = logger.read_match(log_path)
+        assert loaded_data["scores"] == {"0": 1, "1": 0}
+        with open(loaded_data["moves_log"], 'r') as f:
+            assert json.loads(f.readline()) == {"counts": {"2": 3}}
+    
+    def test_log_move_streams_json_lines(self, temp_log_dir):
+        """Test that streamed moves are written as JSON Lines and closed with the match."""
+        logger = Logger(temp_log_dir)
+        
+        logger.log_move("test-stream-123", {"player": 0, "move": "0,0"})
+        logger.log_move("test-stream-123", {"player": 1, "move": "1,1"})
+        log_path = logger.log_match({"match_id": "test-stream-123", "game": "Gomoku"})
+        
+        with open(log_path, 'r') as f:
+            loaded_data = json.load(f)
+        
+        moves_log = loaded_data["moves_log"]
+        with open(moves_log, 'r') as f:
+            moves = [json.loads(line) for line in f]
+        
+        assert moves == [{"player": 0, "move": "0,0"}, {"player": 1, "move": "1,1"}]
+        assert logger._move_streams == {}
+    
+    def test_log_match_stream_appends_json_lines(self, temp_log_dir):
+        """Test that streamed matches share one NDJSON file and read back in order."""
+        logger = Logger(temp_log_dir)
+        
+        paths = {logger.log_match_stream({"match_id": f"test-ndjson-{i}", "final_state": np.eye(2, dtype=np.int8)})
+                 for i in range(3)}
+        
+        assert len(paths) == 1
+        matches = logger.read_match_stream()
+        assert [match["match_id"] for match in matches] == ["test-ndjson-0", "test-ndjson-1", "test-ndjson-2"]
+        assert matches[0]["final_state"] == [[1, 0], [0, 1]]
+        
+        logger.close()
+        with open(paths.pop(), 'r') as f:
+            assert len(f.read().splitlines()) == 3
+    
+    def test_context_manager_flushes_match_stream(self, temp_log_dir):
+        """Test that leaving the logger's with block writes out buffered matches."""
+        with Logger(temp_log_dir) as logger:
+            path = logger.log_match_stream({"match_id": "test-with-123"})
+            
+            assert os.path.getsize(path) == 0  # Still in the buffer
+        
+        assert logger._match_stream is None
+        with open(path, 'r') as f:
+            assert json.loads(f.read()) == {"match_id": "test-with-123"}
+    
     def test_read_match(self, temp_log_dir):
         """Test reading match data from a file."""
         logger = Logger(temp_log_dir)
@@ -126,6 +265,38 @@ class TestLogger:
         assert loaded_data["game"] == sample_data["game"]
         assert loaded_data["winner"] == sample_data["winner"]
     
+    def test_read_match_round_trip(self, temp_log_dir):
+        """Test that a logged match reads back with arrays as nested lists."""
+        logger = Logger(temp_log_dir)
+        board = np.eye(3, dtype=np.int8)
+        
+        log_path = logger.log_match({"match_id": "test-round-trip-123", "final_state": board})
+        
+        assert logger.read_match(log_path) == {"match_id": "test-round-trip-123", "final_state": board.tolist()}
+    
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard package is not installed")
+    def test_binary_log_round_trip(self, temp_log_dir):
+        """Test that binary logs keep numpy arrays and are read back by extension."""
+        logger = Logger(temp_log_dir)
+        board = np.eye(3, dtype=np.int8)
+        
+        log_path = logger.log_match({"match_id": "test-binary-123", "game": "Gomoku", "final_state": board},
+                                    binary=True)
+        
+        assert log_path.endswith(".pkl.zst")
+        loaded_data = logger.read_match(log_path)
+        assert loaded_data["match_id"] == "test-binary-123"
+        assert loaded_data["final_state"].dtype == np.int8
+        assert np.array_equal(loaded_data["final_state"], board)
+    
+    def test_binary_log_requires_zstandard(self, temp_log_dir):
+        """Test that binary logging reports the missing optional dependency."""
+        logger = Logger(temp_log_dir)
+        
+        with patch("boardbench.utils.logger.ZSTD_AVAILABLE", False):
+            with pytest.raises(ImportError):
+                logger.log_match({"match_id": "test-binary-456"}, binary=True)
+    
     def test_read_match_nonexistent_file(self, temp_log_dir):
         """Test reading from a nonexistent file raises appropriate error."""
         logger = Logger(temp_log_dir)